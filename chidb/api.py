@@ -3,15 +3,18 @@ Public API for the ChiDB database.
 Provides high-level interface for applications to interact with the database.
 """
 
-from typing import List, Any, Optional, Dict
-from dataclasses import dataclass
+from typing import List, Any, Optional, Dict, Tuple, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from itertools import islice
 import json
 from chidb.pager import Pager
 from chidb.btree import BTree
-from chidb.dbm import DatabaseMachine
+from chidb.dbm import DatabaseMachine, Instruction
 from chidb.record import Record
-from chidb.sql.lexer import Lexer
-from chidb.sql.parser import Parser, CreateTableStatement, UpdateStatement, DeleteStatement, DropTableStatement, AlterTableStatement, ColumnDef, SelectStatement
+from chidb.sql.lexer import Lexer, TokenType
+from chidb.sql.parser import Parser, ASTNode, CreateTableStatement, InsertStatement, UpdateStatement, DeleteStatement, DropTableStatement, AlterTableStatement, ColumnDef, SelectStatement, BinaryOp, Literal, Identifier
 from chidb.sql.optimizer import Optimizer
 from chidb.sql.codegen import CodeGenerator
 from chidb.log import get_logger
@@ -30,6 +33,22 @@ from chidb.security import (
 # System catalog constants
 SYSTEM_CATALOG_PAGE = 1  # Reserved page for system catalog
 
+# Maximum number of parsed statements kept in the statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# WHERE comparison operators and their Python spelling for compiled predicates
+WHERE_SOURCE_OPERATORS = {
+    '=': '==',
+    '!=': '!=',
+    '<': '<',
+    '>': '>',
+    '<=': '<=',
+    '>=': '>=',
+}
+
+# Catalog entries are written compactly; the encoder is built once, not per dumps() call
+CATALOG_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
 
 @dataclass
 class TableMetadata:
@@ -39,6 +58,29 @@ class TableMetadata:
     columns: List[ColumnDef]
     primary_key_column: Optional[str] = None
     next_auto_increment: int = 1
+    # Column name -> position, derived from columns (not serialized)
+    column_index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    # Last serialized catalog JSON and the (root_page, next_auto_increment) it was built from
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _json_state: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.reindex_columns()
+    
+    def reindex_columns(self) -> None:
+        """Rebuild column_index after the column list changes."""
+        self.column_index = {}
+        for i, col in enumerate(self.columns):
+            self.column_index.setdefault(col.name, i)
+        self._json = None
+    
+    def serialize(self) -> str:
+        """Serialize to catalog JSON, reusing the last result while unchanged."""
+        state = (self.root_page, self.next_auto_increment)
+        if self._json is None or self._json_state != state:
+            self._json = CATALOG_JSON_ENCODER.encode(self.to_dict())
+            self._json_state = state
+        return self._json
     
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
@@ -57,6 +99,14 @@ class TableMetadata:
             'next_auto_increment': self.next_auto_increment
         }
     
+    @staticmethod
+    def from_json(json_data: str) -> 'TableMetadata':
+        """Create from catalog JSON, keeping it as the serialized form."""
+        metadata = TableMetadata.from_dict(json.loads(json_data))
+        metadata._json = json_data
+        metadata._json_state = (metadata.root_page, metadata.next_auto_increment)
+        return metadata
+    
     @staticmethod
     def from_dict(data: dict) -> 'TableMetadata':
         """Create from dictionary."""
@@ -77,6 +127,40 @@ class TableMetadata:
         )
 
 
+class TableRegistry(MutableMapping):
+    """
+    Live table name -> root page view over the table metadata.
+    
+    The metadata is the single source of truth, so root page changes never
+    need to be mirrored into a second dict.
+    """
+    
+    def __init__(self, table_metadata: Dict[str, TableMetadata]):
+        self._metadata = table_metadata
+    
+    def __getitem__(self, table_name: str) -> int:
+        return self._metadata[table_name].root_page
+    
+    def __setitem__(self, table_name: str, root_page: int) -> None:
+        metadata = self._metadata.get(table_name)
+        if metadata is None:
+            self._metadata[table_name] = TableMetadata(name=table_name, root_page=root_page, columns=[])
+        else:
+            metadata.root_page = root_page
+    
+    def __delitem__(self, table_name: str) -> None:
+        del self._metadata[table_name]
+    
+    def __contains__(self, table_name: object) -> bool:
+        return table_name in self._metadata
+    
+    def __iter__(self):
+        return iter(self._metadata)
+    
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+
 class YesDB:
     """
     Main database interface.
@@ -111,13 +195,44 @@ class YesDB:
         self.dbm = DatabaseMachine(self.pager)
         self.codegen = CodeGenerator()
         self.optimizer = Optimizer()
+        self._lexer = Lexer()
+        self._parser = Parser()
         self.logger = get_logger("api")
         
         # Table metadata: maps table name -> TableMetadata
         self.table_metadata: Dict[str, TableMetadata] = {}
         
-        # Legacy tables dict for backward compatibility
-        self.tables: Dict[str, int] = {}
+        # Legacy table name -> root page mapping, kept as a view over the metadata
+        self.tables = TableRegistry(self.table_metadata)
+        
+        # Statements executed directly against the B-trees, keyed on their
+        # leading keyword; everything else goes through optimizer/codegen/DBM
+        self._stmt_handlers: Dict[TokenType, Callable[[ASTNode], List[List[Any]]]] = {
+            TokenType.CREATE: self._execute_create_table,
+            TokenType.UPDATE: self._execute_update,
+            TokenType.DELETE: self._execute_delete,
+            TokenType.DROP: self._execute_drop_table,
+            TokenType.ALTER: self._execute_alter_table,
+        }
+        
+        # Prepared-statement cache: normalized SQL -> (keyword, AST) in LRU order
+        self._stmt_cache: 'OrderedDict[str, Tuple[TokenType, ASTNode]]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Compiled plan cache: statement shape -> parameterized instructions
+        self._plan_cache: 'OrderedDict[tuple, List[Instruction]]' = OrderedDict()
+        
+        # Table B-trees reused across statements: table name -> BTree
+        self._btree_cache: Dict[str, BTree] = {}
+        
+        # Compiled WHERE predicates: (table, expression repr) -> predicate
+        self._where_cache: Dict[tuple, Callable[[Record], bool]] = {}
+        
+        # Catalog entries as last written: table name -> (catalog key, JSON)
+        self._catalog_entries: Dict[str, Tuple[int, str]] = {}
+        self._stale_catalog_keys: List[int] = []
+        self._next_catalog_key = 1
         
         # Initialize system (load existing tables if any)
         self._initialize()
@@ -137,7 +252,7 @@ class YesDB:
         # Create a B-tree for the system catalog
         self.catalog_btree = BTree(self.pager)
         self.catalog_root = self.catalog_btree.get_root_page()
-        self.logger.info(f"Created system catalog at page {self.catalog_root}")
+        self.logger.info("Created system catalog at page %s", self.catalog_root)
     
     def _load_system_catalog(self) -> None:
         """Load table metadata from system catalog."""
@@ -147,42 +262,68 @@ class YesDB:
         
         # Scan the catalog and load all table metadata
         try:
-            catalog_records = self.catalog_btree.scan()
-            
-            for key, record in catalog_records:
+            for key, record in self.catalog_btree.iter_scan():
                 # Record contains JSON-serialized table metadata
                 json_data = record.get_value(0)
                 if json_data:
-                    metadata_dict = json.loads(json_data)
-                    metadata = TableMetadata.from_dict(metadata_dict)
+                    metadata = TableMetadata.from_json(json_data)
                     
                     self.table_metadata[metadata.name] = metadata
-                    self.tables[metadata.name] = metadata.root_page
                     
-                    self.logger.info(f"Loaded table '{metadata.name}' from catalog")
+                    # A later entry for the same table supersedes an earlier one
+                    previous = self._catalog_entries.get(metadata.name)
+                    if previous is not None:
+                        self._stale_catalog_keys.append(previous[0])
+                    self._catalog_entries[metadata.name] = (key, json_data)
+                    
+                    self.logger.info("Loaded table '%s' from catalog", metadata.name)
+                
+                self._next_catalog_key = max(self._next_catalog_key, key + 1)
         except Exception as e:
-            self.logger.warning(f"Could not load system catalog: {e}")
+            self.logger.warning("Could not load system catalog: %s", e)
             # If catalog is corrupt, start fresh
             self.catalog_btree = BTree(self.pager, self.catalog_root)
+            self._catalog_entries.clear()
+            self._stale_catalog_keys.clear()
     
     def _save_table_to_catalog(self, metadata: TableMetadata) -> None:
         """Save table metadata to system catalog."""
-        # Serialize metadata to JSON
-        metadata_dict = metadata.to_dict()
-        json_data = json.dumps(metadata_dict)
+        if self._write_catalog_entry(metadata):
+            self.pager.flush()
+            self.logger.info("Saved table '%s' to catalog", metadata.name)
+    
+    def _write_catalog_entry(self, metadata: TableMetadata) -> bool:
+        """
+        Upsert a table's catalog entry, skipping it if nothing changed.
         
-        # Create a record with the JSON data
-        record = Record([json_data])
+        Returns:
+            True if the catalog was modified
+        """
+        json_data = metadata.serialize()
+        entry = self._catalog_entries.get(metadata.name)
+        if entry is not None and entry[1] == json_data:
+            return False
         
-        # Use a simple key (could use hash of table name)
-        # For simplicity, use incremental keys
-        key = len(self.table_metadata)
+        # Create a record with the JSON-serialized metadata
+        record = Record([json_data])
         
-        # Insert into catalog
-        self.catalog_btree.insert(key, record)
-        self.pager.flush()
+        if entry is None:
+            key = self._next_catalog_key
+            self._next_catalog_key += 1
+            self.catalog_btree.insert(key, record)
+        else:
+            key = entry[0]
+            self.catalog_btree.update(key, record)
         
-        self.logger.info(f"Saved table '{metadata.name}' to catalog")
+        self._catalog_entries[metadata.name] = (key, json_data)
+        return True
+    
+    def _delete_catalog_entry(self, table_name: str) -> None:
+        """Remove a dropped table's catalog entry."""
+        entry = self._catalog_entries.pop(table_name, None)
+        if entry is not None:
+            self.catalog_btree.delete(entry[0])
+            self.pager.flush()
     
     def execute(self, sql: str) -> List[List[Any]]:
         """
@@ -201,69 +342,46 @@ class YesDB:
         try:
             # Validate SQL length to prevent resource exhaustion
             validate_sql_length(sql)
-            # Lexical analysis
-            lexer = Lexer(sql)
-            tokens = lexer.tokenize()
-            
-            # Parsing
-            parser = Parser(tokens)
-            ast = parser.parse()
-            
-            # Handle CREATE TABLE specially (creates B-tree)
-            if isinstance(ast, CreateTableStatement):
-                return self._execute_create_table(ast)
-            
-            # Handle UPDATE specially (direct B-tree operation)
-            if isinstance(ast, UpdateStatement):
-                return self._execute_update(ast)
-            
-            # Handle DELETE specially (direct B-tree operation)
-            if isinstance(ast, DeleteStatement):
-                return self._execute_delete(ast)
             
-            # Handle DROP TABLE
-            if isinstance(ast, DropTableStatement):
-                return self._execute_drop_table(ast)
+            # Lexing and parsing (skipped for cached statements)
+            keyword, ast = self._parse(sql)
             
-            # Handle ALTER TABLE
-            if isinstance(ast, AlterTableStatement):
-                return self._execute_alter_table(ast)
+            # Route on the statement's leading keyword; only SELECT and
+            # INSERT go through the optimizer/codegen/DBM pipeline
+            handler = self._stmt_handlers.get(keyword)
+            if handler is not None:
+                return handler(ast)
             
-            # Handle SELECT with ORDER BY/LIMIT
-            if isinstance(ast, SelectStatement) and (ast.order_by or ast.limit or ast.offset or ast.distinct):
-                return self._execute_select_advanced(ast)
-            
-            # Optimization
-            ast = self.optimizer.optimize(ast)
+            if keyword is TokenType.SELECT:
+                # Handle SELECT with ORDER BY/LIMIT
+                if ast.order_by or ast.limit or ast.offset or ast.distinct:
+                    return self._execute_select_advanced(ast)
+                
+                # Plain SELECT * is a straight table scan, no need for the VM
+                if ast.columns == ['*'] and ast.where is None and ast.table in self.table_metadata:
+                    return self._execute_select_all(ast)
             
-            # Code generation
+            # Optimization and code generation (cached for INSERT and SELECT)
             self.codegen.table_registry = self.tables
             self.codegen.table_metadata = self.table_metadata
-            instructions = self.codegen.generate(ast)
+            if keyword is TokenType.INSERT:
+                instructions, params = self._compile_insert(self.optimizer.optimize(ast))
+            elif keyword is TokenType.SELECT:
+                instructions, params = self._compile_select(self._statement_key(sql), ast), None
+            else:
+                instructions, params = self.codegen.generate(self.optimizer.optimize(ast)), None
             
             # Execution
-            results = self.dbm.execute(instructions)
-
-            # Sync root page changes from BTrees back to metadata
-            # (splits may have created new roots)
-            metadata_changed = False
-            for root_page, btree in list(self.dbm.btrees.items()):
-                if btree.root_page != root_page:
-                    # Root page changed, update metadata
-                    for table_name, metadata in self.table_metadata.items():
-                        if metadata.root_page == root_page:
-                            metadata.root_page = btree.root_page
-                            # CRITICAL FIX: Also update self.tables dict
-                            self.tables[table_name] = btree.root_page
-                            self._save_table_to_catalog(metadata)
-                            metadata_changed = True
-                            break
-
-            # Clear the btrees cache to force fresh lookups with updated metadata
-            # This ensures subsequent operations use the correct root pages
-            if metadata_changed:
-                self.dbm.btrees.clear()
+            results = self.dbm.execute(instructions, params)
 
+            # Only INSERT modifies a tree through the VM; a split may have
+            # moved the table's root page
+            if keyword is TokenType.INSERT:
+                table_meta = self.table_metadata.get(ast.table)
+                btree = self.dbm.btrees.get(table_meta.root_page) if table_meta else None
+                if btree is not None:
+                    self._sync_root_page(table_meta, btree)
+            
             return results
 
         except SecurityError:
@@ -271,13 +389,120 @@ class YesDB:
             raise
         except Exception as e:
             # Sanitize error message in production mode
-            self.logger.error(f"Error executing SQL: {e}")
+            self.logger.error("Error executing SQL: %s", e)
             if not self.debug_mode:
                 # Provide sanitized error message
                 safe_message = sanitize_error_message(e, self.debug_mode)
                 raise type(e)(safe_message) from None
             raise
     
+    def _parse(self, sql: str) -> Tuple[TokenType, ASTNode]:
+        """
+        Parse a SQL statement, reusing a cached AST when the same text was seen before.
+        
+        Returns:
+            (leading keyword token type, AST) - the keyword is used for routing
+        """
+        key = self._statement_key(sql)
+        
+        entry = self._stmt_cache.get(key)
+        if entry is not None:
+            self._stmt_cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+        
+        self.cache_misses += 1
+        
+        # Lexical analysis and parsing with the long-lived instances
+        tokens = self._lexer.tokenize(sql)
+        entry = (tokens[0].type, self._parser.parse(tokens))
+        
+        self._stmt_cache[key] = entry
+        if len(self._stmt_cache) > STATEMENT_CACHE_SIZE:
+            self._stmt_cache.popitem(last=False)
+        
+        return entry
+    
+    @staticmethod
+    def _statement_key(sql: str) -> str:
+        """
+        Cache key for a statement: the text with surrounding whitespace and
+        trailing semicolons removed, so trivially different spellings share
+        cache entries.
+        """
+        return sql.strip().rstrip(';').rstrip()
+    
+    def _normalize_ast(self, stmt: InsertStatement) -> tuple:
+        """
+        Build the plan cache key for an INSERT.
+        
+        Literal values are left out of the key (they become VARIABLE parameters),
+        so INSERTs differing only in their values share one compiled program.
+        """
+        return ('INSERT', stmt.table, self.codegen.get_table_root(stmt.table), len(stmt.values))
+    
+    def _compile_insert(self, stmt: InsertStatement):
+        """
+        Get the (cached) parameterized program for an INSERT and bind its values.
+        
+        Returns:
+            (instructions, params) ready for dbm.execute
+        """
+        plan_key = self._normalize_ast(stmt)
+        
+        instructions = self._plan_cache.get(plan_key)
+        if instructions is None:
+            instructions = self.codegen.generate_insert_template(stmt)
+            self._plan_cache[plan_key] = instructions
+            if len(self._plan_cache) > STATEMENT_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+        else:
+            self._plan_cache.move_to_end(plan_key)
+        
+        return instructions, self.codegen.bind_insert(stmt)
+    
+    def _compile_select(self, key: str, stmt: SelectStatement) -> List[Instruction]:
+        """
+        Get the (cached) optimized program for a SELECT run on the VM.
+        
+        Programs embed the table's root page, so it is part of the cache key
+        and a root page moved by a split simply misses.
+        """
+        table_meta = self.table_metadata.get(stmt.table)
+        if table_meta is None:
+            # Let codegen report the unknown table
+            return self.codegen.generate(self.optimizer.optimize(stmt))
+        
+        plan_key = ('SELECT', key, table_meta.root_page)
+        
+        instructions = self._plan_cache.get(plan_key)
+        if instructions is None:
+            self._resolve_projection(stmt.columns, table_meta)
+            instructions = self.codegen.generate(self.optimizer.optimize(stmt))
+            self._plan_cache[plan_key] = instructions
+            if len(self._plan_cache) > STATEMENT_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+        else:
+            self._plan_cache.move_to_end(plan_key)
+        
+        return instructions
+    
+    def _invalidate_statement_cache(self) -> None:
+        """Drop all cached statements and plans (called after schema changes)."""
+        self._stmt_cache.clear()
+        self._plan_cache.clear()
+        self._where_cache.clear()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get statement cache statistics."""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._stmt_cache),
+            'plans': len(self._plan_cache),
+            'max_size': STATEMENT_CACHE_SIZE
+        }
+    
     def _execute_create_table(self, stmt: CreateTableStatement) -> List[List[Any]]:
         """
         Execute CREATE TABLE statement.
@@ -287,7 +512,7 @@ class YesDB:
         table_name = stmt.table
 
         # Security validations
-        check_table_count(len(self.tables))
+        check_table_count(len(self.table_metadata))
         validate_table_name(table_name)
         check_column_count(len(stmt.columns))
 
@@ -295,7 +520,7 @@ class YesDB:
         for col in stmt.columns:
             validate_column_name(col.name)
 
-        if table_name in self.tables:
+        if table_name in self.table_metadata:
             raise ValueError(f"Table '{table_name}' already exists")
         
         # Create a new B-tree for this table
@@ -313,19 +538,19 @@ class YesDB:
         metadata = TableMetadata(
             name=table_name,
             root_page=root_page,
-            columns=stmt.columns,
+            columns=list(stmt.columns),
             primary_key_column=primary_key_column,
             next_auto_increment=1
         )
         
         # Register the table
         self.table_metadata[table_name] = metadata
-        self.tables[table_name] = root_page
         
         # Save to system catalog
         self._save_table_to_catalog(metadata)
+        self._invalidate_statement_cache()
         
-        self.logger.info(f"Created table '{table_name}' with root page {root_page}, PK: {primary_key_column}")
+        self.logger.info("Created table '%s' with root page %s, PK: %s", table_name, root_page, primary_key_column)
         
         return []  # CREATE TABLE returns no rows
     
@@ -335,49 +560,38 @@ class YesDB:
         
         Updates records in the table.
         """
-        from chidb.record import Record
-        
         table_name = stmt.table
-        if table_name not in self.tables:
-            raise ValueError(f"Table '{table_name}' does not exist")
-        
-        root_page = self.tables[table_name]
         table_meta = self.table_metadata.get(table_name)
+        if table_meta is None:
+            raise ValueError(f"Table '{table_name}' does not exist")
         
         # Get the B-tree
-        btree = BTree(self.pager, root_page)
+        btree = self._get_btree(table_meta)
         
-        # Scan all records
-        all_records = btree.scan()
+        # Resolve the assignment columns once per statement
+        assignments = self._resolve_assignments(stmt.assignments, table_meta)
         
-        updated_count = 0
-        for key, record in all_records:
-            # Check if this record matches WHERE clause (if any)
-            # For now, update all records if no WHERE clause
-            should_update = True
-            
-            if stmt.where:
-                # Simple WHERE evaluation (only supports column = value)
-                should_update = self._evaluate_where(record, stmt.where, table_meta)
-            
-            if should_update:
-                # Get current values
-                values = list(record.get_values())
-                
-                # Apply updates
-                for col_name, new_value in stmt.assignments:
-                    # Find column index
-                    for i, col_def in enumerate(table_meta.columns):
-                        if col_def.name == col_name:
-                            values[i] = new_value
-                            break
-                
-                # Update the record
-                new_record = Record(values)
-                btree.update(key, new_record)
-                updated_count += 1
+        # Collect the matching records before modifying the tree; with a WHERE
+        # clause only the matches are kept, not the whole table
+        if stmt.where:
+            matching = self._find_matching(btree, stmt.where, table_meta)
+        else:
+            matching = btree.scan()
+        
+        updates = []
+        for key, record in matching:
+            # The scanned record is ours, so patch its values in place
+            for col_index, new_value in assignments:
+                record.set_value(col_index, new_value)
+            updates.append((key, record))
+        
+        # Write the new records back in one pass over the tree
+        updated_count = btree.update_many(updates)
+        
+        # Records that outgrew their cell are re-inserted and may split the root
+        self._sync_root_page(table_meta, btree)
         
-        self.logger.info(f"Updated {updated_count} rows in '{table_name}'")
+        self.logger.info("Updated %d rows in '%s'", updated_count, table_name)
         return []
     
     def _execute_delete(self, stmt: DeleteStatement) -> List[List[Any]]:
@@ -387,161 +601,268 @@ class YesDB:
         Deletes records from the table.
         """
         table_name = stmt.table
-        if table_name not in self.tables:
-            raise ValueError(f"Table '{table_name}' does not exist")
-        
-        root_page = self.tables[table_name]
         table_meta = self.table_metadata.get(table_name)
+        if table_meta is None:
+            raise ValueError(f"Table '{table_name}' does not exist")
         
         # Get the B-tree
-        btree = BTree(self.pager, root_page)
+        btree = self._get_btree(table_meta)
         
-        # Scan all records to find ones to delete
-        all_records = btree.scan()
-        keys_to_delete = []
-        
-        for key, record in all_records:
-            # Check if this record matches WHERE clause
-            should_delete = True
-            
-            if stmt.where:
-                should_delete = self._evaluate_where(record, stmt.where, table_meta)
-            
-            if should_delete:
-                keys_to_delete.append(key)
+        # Stream the table, keeping only the keys to delete; without a WHERE
+        # clause no record needs decoding
+        if stmt.where:
+            matching = self._find_matching(btree, stmt.where, table_meta)
+            keys_to_delete = [key for key, _ in matching]
+        else:
+            keys_to_delete = list(btree.iter_keys())
         
-        # Delete the keys
-        for key in keys_to_delete:
-            btree.delete(key)
+        # Delete the keys in one pass over the tree (scan yields them in order)
+        btree.delete_many(keys_to_delete)
         
-        self.logger.info(f"Deleted {len(keys_to_delete)} rows from '{table_name}'")
+        self.logger.info("Deleted %d rows from '%s'", len(keys_to_delete), table_name)
         return []
     
-    def _evaluate_where(self, record: 'Record', where_expr, table_meta) -> bool:
+    def _get_btree(self, table_meta: TableMetadata) -> BTree:
         """
-        Evaluate WHERE clause for a record.
+        Return the cached B-tree for a table, rebuilt if its root page moved.
         
-        Simplified implementation - only supports: column = value
+        The instance is the one the VM opens for the same root page, so
+        statements run through either path share its state.
+        """
+        btree = self._btree_cache.get(table_meta.name)
+        if btree is None or btree.root_page != table_meta.root_page:
+            btree = self.dbm.get_btree(table_meta.root_page)
+            self._btree_cache[table_meta.name] = btree
+        return btree
+    
+    def _sync_root_page(self, table_meta: TableMetadata, btree: BTree) -> None:
+        """Record a root page moved by splits while a statement modified the tree."""
+        if btree.root_page != table_meta.root_page:
+            # The VM keys the tree by its old root page; move it to the new one
+            self.dbm.invalidate_btree(table_meta.root_page)
+            self.dbm.btrees[btree.root_page] = btree
+            table_meta.root_page = btree.root_page
+            self._save_table_to_catalog(table_meta)
+    
+    def _find_matching(self, btree: BTree, where_expr, table_meta) -> List[Tuple[int, Record]]:
         """
-        from chidb.sql.parser import BinaryOp, Literal, Identifier
+        Find the (key, record) pairs matching a WHERE clause.
         
-        if isinstance(where_expr, BinaryOp):
-            # Get left side (should be column name)
-            if isinstance(where_expr.left, Identifier):
-                col_name = where_expr.left.name
-                
-                # Find column index
-                col_index = None
-                for i, col_def in enumerate(table_meta.columns):
-                    if col_def.name == col_name:
-                        col_index = i
-                        break
-                
-                if col_index is None:
-                    return False
-                
-                # Get record value
-                record_value = record.get_value(col_index)
-                
-                # Get comparison value
-                if isinstance(where_expr.right, Literal):
-                    compare_value = where_expr.right.value
-                else:
-                    return False
-                
-                # Perform comparison
-                if where_expr.operator == '=':
-                    return record_value == compare_value
-                elif where_expr.operator == '!=':
-                    return record_value != compare_value
-                elif where_expr.operator == '<':
-                    return record_value < compare_value
-                elif where_expr.operator == '>':
-                    return record_value > compare_value
-                elif where_expr.operator == '<=':
-                    return record_value <= compare_value
-                elif where_expr.operator == '>=':
-                    return record_value >= compare_value
+        An equality test on the primary key (which is the B-tree key) is a
+        point lookup; anything else streams the table through the compiled
+        scan filter.
+        """
+        scan = self._compile_scan(where_expr, table_meta)
         
-        return True
+        key = self._primary_key_lookup(where_expr, table_meta)
+        if key is None:
+            return scan(btree.iter_scan())
+        
+        record = btree.search(key)
+        if record is None:
+            return []
+        # Still check the row itself, exactly as the scan would
+        return scan([(key, record)])
+    
+    def _primary_key_lookup(self, where_expr, table_meta) -> Optional[int]:
+        """Return the key if the WHERE clause is 'primary_key = <integer>'."""
+        if not (isinstance(where_expr, BinaryOp) and where_expr.operator == '='):
+            return None
+        if not (isinstance(where_expr.left, Identifier) and isinstance(where_expr.right, Literal)):
+            return None
+        if table_meta.primary_key_column is None or where_expr.left.name != table_meta.primary_key_column:
+            return None
+        
+        value = where_expr.right.value
+        return value if type(value) is int else None
+    
+    def _resolve_assignments(self, assignments: List[tuple], table_meta) -> List[Tuple[int, Any]]:
+        """
+        Resolve UPDATE assignments to (column_index, value) pairs.
+        
+        Assignments to unknown columns are ignored.
+        """
+        column_index = table_meta.column_index
+        return [(column_index[col_name], new_value)
+                for col_name, new_value in assignments
+                if col_name in column_index]
+    
+    def _resolve_projection(self, columns: List[str], table_meta: TableMetadata) -> Optional[List[int]]:
+        """
+        Resolve selected column names to record positions.
+        
+        Returns:
+            The column indices, or None for SELECT *
+        
+        Raises:
+            ValueError: If a column does not exist
+        """
+        if columns == ['*']:
+            return None
+        column_index = table_meta.column_index
+        for col_name in columns:
+            if col_name not in column_index:
+                raise ValueError(f"Column '{col_name}' does not exist in table '{table_meta.name}'")
+        return [column_index[col_name] for col_name in columns]
+    
+    def _compile_scan(self, where_expr, table_meta) -> Callable:
+        """
+        Compile a WHERE clause into a filter over scanned (key, record) pairs.
+        
+        The whole column scan is compiled as one list comprehension, so the
+        predicate runs inline in a single code object rather than as a
+        function call per record.
+        """
+        template = 'lambda rows: [(key, record) for key, record in rows if {}]'
+        return self._compile_where_code(template, where_expr, table_meta)
+    
+    def _compile_value_scan(self, where_expr, table_meta) -> Callable:
+        """
+        Compile a WHERE clause into a lazy filter yielding matching value lists.
+        
+        Filtering and unpacking each record's values happen in one generator
+        expression, so callers that may stop early only pay for rows they take.
+        """
+        template = 'lambda rows: (record.values for key, record in rows if {})'
+        return self._compile_where_code(template, where_expr, table_meta)
+    
+    def _compile_where_code(self, template: str, where_expr, table_meta) -> Callable:
+        """Compile template with the WHERE source spliced in, caching per table."""
+        cache_key = (table_meta.name, template, repr(where_expr))
+        compiled = self._where_cache.get(cache_key)
+        if compiled is not None:
+            return compiled
+        
+        constants: Dict[str, Any] = {}
+        source = template.format(self._where_source(where_expr, table_meta, constants))
+        code = compile(source, '<where>', 'eval')
+        compiled = eval(code, constants)
+        
+        self._where_cache[cache_key] = compiled
+        if len(self._where_cache) > STATEMENT_CACHE_SIZE:
+            self._where_cache.pop(next(iter(self._where_cache)))
+        
+        return compiled
+    
+    def _where_source(self, expr, table_meta, constants: Dict[str, Any]) -> str:
+        """
+        Translate a WHERE expression into Python source for _compile_where_code.
+        
+        Supports column-vs-literal comparisons combined with AND/OR. A
+        comparison on an unknown column or against a non-literal is False;
+        other unsupported forms match every record.
+        """
+        if not isinstance(expr, BinaryOp):
+            return 'True'
+        
+        if expr.operator in ('AND', 'OR'):
+            left = self._where_source(expr.left, table_meta, constants)
+            right = self._where_source(expr.right, table_meta, constants)
+            return f"({left} {expr.operator.lower()} {right})"
+        
+        if not isinstance(expr.left, Identifier):
+            return 'True'
+        
+        col_index = table_meta.column_index.get(expr.left.name)
+        if col_index is None or not isinstance(expr.right, Literal):
+            return 'False'
+        
+        python_operator = WHERE_SOURCE_OPERATORS.get(expr.operator)
+        if python_operator is None:
+            return 'True'
+        
+        name = f"c{len(constants)}"
+        constants[name] = expr.right.value
+        return f"record.values[{col_index}] {python_operator} {name}"
+    
+    def _execute_select_all(self, stmt: SelectStatement) -> List[List[Any]]:
+        """
+        Execute SELECT * without WHERE, ORDER BY, LIMIT, OFFSET, or DISTINCT.
+        
+        Scans the table B-tree directly, producing the same rows as the
+        generated scan program without the optimizer, codegen, and VM.
+        """
+        btree = self._get_btree(self.table_metadata[stmt.table])
+        return [[record] for _, record in btree.iter_scan()]
     
     def _execute_select_advanced(self, stmt: SelectStatement) -> List[List[Any]]:
         """
         Execute SELECT with ORDER BY, LIMIT, OFFSET, or DISTINCT.
-        """
-        from chidb.record import Record
         
+        Rows are returned as plain value lists, already projected. They flow
+        through the filter, projection, DISTINCT and LIMIT steps
+        lazily, so without ORDER BY the scan stops after OFFSET + LIMIT rows.
+        """
         table_name = stmt.table
-        if table_name not in self.tables:
+        table_meta = self.table_metadata.get(table_name)
+        if table_meta is None:
             raise ValueError(f"Table '{table_name}' does not exist")
         
-        root_page = self.tables[table_name]
-        table_meta = self.table_metadata.get(table_name)
-        btree = BTree(self.pager, root_page)
-        
-        # Scan all records
-        all_records = btree.scan()
-        
-        # Convert to result rows
-        results = []
-        for key, record in all_records:
-            # Apply WHERE filter if present
-            if stmt.where:
-                if not self._evaluate_where(record, stmt.where, table_meta):
-                    continue
-            
-            # Extract values
-            values = record.get_values()
-            
-            # Filter columns if not SELECT *
-            if stmt.columns != ['*'] and table_meta:
-                filtered_values = []
-                for col_name in stmt.columns:
-                    for i, col_def in enumerate(table_meta.columns):
-                        if col_def.name == col_name:
-                            if i < len(values):
-                                filtered_values.append(values[i])
-                            break
-                values = filtered_values
-            
-            results.append([Record(values)])
+        btree = self._get_btree(table_meta)
         
-        # Apply DISTINCT
-        if stmt.distinct:
-            seen = set()
-            unique_results = []
-            for row in results:
-                row_tuple = tuple(row[0].get_values())
-                if row_tuple not in seen:
-                    seen.add(row_tuple)
-                    unique_results.append(row)
-            results = unique_results
-        
-        # Apply ORDER BY
+        # Resolve the projected columns once, before scanning
+        projection = self._resolve_projection(stmt.columns, table_meta)
+        
+        # Stream the table through the WHERE filter
+        rows = btree.iter_scan()
+        if stmt.where:
+            values = self._compile_value_scan(stmt.where, table_meta)(rows)
+        else:
+            values = (record.values for _, record in rows)
+        
+        # Apply ORDER BY on the full rows, so sort columns need not be projected;
+        # this is the only step that has to see every row
         if stmt.order_by:
-            for col_name, direction in reversed(stmt.order_by):
-                # Find column index
-                col_index = None
-                for i, col_def in enumerate(table_meta.columns):
-                    if col_def.name == col_name:
-                        col_index = i
-                        break
-                
-                if col_index is not None:
-                    results.sort(
-                        key=lambda row: row[0].get_values()[col_index] if col_index < len(row[0].get_values()) else None,
-                        reverse=(direction == 'DESC')
-                    )
+            values = list(values)
+            sort_keys = [(table_meta.column_index[col_name], direction == 'DESC')
+                         for col_name, direction in stmt.order_by
+                         if col_name in table_meta.column_index]
+            self._sort_rows(values, sort_keys)
         
-        # Apply OFFSET
-        if stmt.offset:
-            results = results[stmt.offset:]
+        # Filter columns if not SELECT *
+        if projection is not None:
+            values = ([row[i] for i in projection if i < len(row)] for row in values)
         
-        # Apply LIMIT
-        if stmt.limit:
-            results = results[:stmt.limit]
+        # Apply DISTINCT
+        if stmt.distinct:
+            values = self._unique_rows(values)
+        
+        # Apply OFFSET and LIMIT, stopping the scan once enough rows are produced
+        start = stmt.offset or 0
+        stop = start + stmt.limit if stmt.limit else None
+        return list(islice(values, start, stop))
+    
+    @staticmethod
+    def _sort_rows(rows: List[List[Any]], sort_keys: List[Tuple[int, bool]]) -> None:
+        """
+        Sort rows in place on (column index, descending) keys.
         
-        return results
+        Consecutive keys sharing a direction are folded into one tuple key,
+        so the usual all-ASC or all-DESC ORDER BY takes a single sort; only
+        a change of direction needs another (stable) pass.
+        """
+        runs: List[Tuple[List[int], bool]] = []
+        for col_index, descending in sort_keys:
+            if runs and runs[-1][1] == descending:
+                runs[-1][0].append(col_index)
+            else:
+                runs.append(([col_index], descending))
+        
+        for indices, descending in reversed(runs):
+            rows.sort(
+                key=lambda row: tuple(row[i] if i < len(row) else None for i in indices),
+                reverse=descending
+            )
+    
+    @staticmethod
+    def _unique_rows(rows: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        """Yield rows, skipping any already seen."""
+        seen = set()
+        for row in rows:
+            row_tuple = tuple(row)
+            if row_tuple not in seen:
+                seen.add(row_tuple)
+                yield row
     
     def _execute_drop_table(self, stmt: DropTableStatement) -> List[List[Any]]:
         """
@@ -549,17 +870,18 @@ class YesDB:
         """
         table_name = stmt.table
         
-        if table_name not in self.tables:
+        if table_name not in self.table_metadata:
             raise ValueError(f"Table '{table_name}' does not exist")
         
         # Remove from metadata
-        del self.table_metadata[table_name]
-        del self.tables[table_name]
+        self.dbm.invalidate_btree(self.table_metadata.pop(table_name).root_page)
+        self._btree_cache.pop(table_name, None)
         
         # Update catalog
-        self._save_all_metadata()
+        self._delete_catalog_entry(table_name)
+        self._invalidate_statement_cache()
         
-        self.logger.info(f"Dropped table '{table_name}'")
+        self.logger.info("Dropped table '%s'", table_name)
         return []
     
     def _execute_alter_table(self, stmt: AlterTableStatement) -> List[List[Any]]:
@@ -568,19 +890,20 @@ class YesDB:
         """
         table_name = stmt.table
         
-        if table_name not in self.tables:
+        table_meta = self.table_metadata.get(table_name)
+        if table_meta is None:
             raise ValueError(f"Table '{table_name}' does not exist")
         
-        table_meta = self.table_metadata[table_name]
-        
         if stmt.action == 'ADD' and stmt.column:
             # Add column to metadata
             table_meta.columns.append(stmt.column)
+            table_meta.reindex_columns()
             
             # Update catalog
-            self._save_all_metadata()
+            self._save_table_to_catalog(table_meta)
+            self._invalidate_statement_cache()
             
-            self.logger.info(f"Added column '{stmt.column.name}' to table '{table_name}'")
+            self.logger.info("Added column '%s' to table '%s'", stmt.column.name, table_name)
         
         return []
     
@@ -590,43 +913,38 @@ class YesDB:
         self._save_all_metadata()
         
         self.pager.close()
-        self.logger.info(f"Closed database '{self.filename}'")
+        self.logger.info("Closed database '%s'", self.filename)
     
     def _save_all_metadata(self) -> None:
         """Save all table metadata to catalog."""
-        # Clear catalog and rewrite all metadata
-        # This ensures auto-increment counters are saved
-        
-        # For simplicity, we'll just update existing entries
-        # A full implementation would rebuild the catalog
-        
+        # Only entries whose serialized metadata changed since they were last
+        # written are touched (e.g. auto-increment counters bumped by INSERT)
         try:
-            # Re-save each table's metadata
-            catalog_records = self.catalog_btree.scan()
+            changed = False
+            for metadata in self.table_metadata.values():
+                changed |= self._write_catalog_entry(metadata)
             
-            # Delete all existing catalog entries
-            for key, _ in catalog_records:
-                self.catalog_btree.delete(key)
+            # Drop superseded entries and entries of tables no longer present
+            for table_name in [name for name in self._catalog_entries if name not in self.table_metadata]:
+                self._stale_catalog_keys.append(self._catalog_entries.pop(table_name)[0])
+            if self._stale_catalog_keys:
+                self.catalog_btree.delete_many(sorted(self._stale_catalog_keys))
+                self._stale_catalog_keys.clear()
+                changed = True
             
-            # Re-insert all current metadata
-            for i, (table_name, metadata) in enumerate(self.table_metadata.items()):
-                metadata_dict = metadata.to_dict()
-                json_data = json.dumps(metadata_dict)
-                record = Record([json_data])
-                self.catalog_btree.insert(i + 1, record)
-            
-            self.pager.flush()
-            self.logger.info("Saved all table metadata to catalog")
+            if changed:
+                self.pager.flush()
+                self.logger.info("Saved all table metadata to catalog")
         except Exception as e:
-            self.logger.error(f"Error saving metadata: {e}")
+            self.logger.error("Error saving metadata: %s", e)
     
     def get_table_names(self) -> List[str]:
         """Get list of table names."""
-        return list(self.tables.keys())
+        return list(self.table_metadata.keys())
     
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists."""
-        return table_name in self.tables
+        return table_name in self.table_metadata
     
     def __enter__(self):
         """Context manager entry."""
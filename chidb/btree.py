@@ -3,14 +3,15 @@ B-Tree implementation for table and index storage.
 Provides persistent ordered key-value storage using B-tree data structure.
 """
 
-from typing import Any, List, Optional, Tuple
+import struct
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from chidb.pager import Pager
 from chidb.record import Record
 from chidb.util import (
-    pack_uint8, unpack_uint8,
     pack_uint16, unpack_uint16,
     pack_uint32, unpack_uint32,
-    pack_varint, unpack_varint
+    pack_varint, unpack_varint, bytes_required_varint
 )
 from chidb.log import get_logger, log_btree_insert, log_btree_search, log_btree_split
 
@@ -22,6 +23,11 @@ NODE_TYPE_LEAF = 2
 # Node header structure (at start of each page)
 # [node_type: 1 byte][num_keys: 2 bytes][right_page: 4 bytes (internal only)]
 NODE_HEADER_SIZE = 7
+NODE_HEADER = struct.Struct('>BHI')
+
+# Headers of new, empty nodes
+_LEAF_HEADER = NODE_HEADER.pack(NODE_TYPE_LEAF, 0, 0)
+_INTERNAL_HEADER = NODE_HEADER.pack(NODE_TYPE_INTERNAL, 0, 0)
 
 
 class BTreeNode:
@@ -34,6 +40,10 @@ class BTreeNode:
     - Cells: key-value pairs (or key-child pairs for internal nodes)
     """
     
+    # A node is built for every page visited, so skip the per-instance __dict__
+    __slots__ = ('page_id', 'page_data', 'page_size', 'is_dirty', 'node_type', 'num_keys', 'right_page',
+                 'free_offset')
+    
     def __init__(self, page_id: int, page_data: bytearray, page_size: int):
         """
         Initialize a B-tree node from page data.
@@ -48,14 +58,12 @@ class BTreeNode:
         self.page_size = page_size
         self.is_dirty = False
         
-        # Parse header
-        self.node_type = unpack_uint8(page_data, 0)
-        self.num_keys = unpack_uint16(page_data, 1)
+        # Lowest cell offset, found on first use and kept current by cell inserts
+        self.free_offset: Optional[int] = None
         
-        if self.node_type == NODE_TYPE_INTERNAL:
-            self.right_page = unpack_uint32(page_data, 3)
-        else:
-            self.right_page = None
+        # Parse header (leaves leave the right_page bytes unused)
+        self.node_type, self.num_keys, right_page = NODE_HEADER.unpack_from(page_data, 0)
+        self.right_page = right_page if self.node_type == NODE_TYPE_INTERNAL else None
     
     def is_leaf(self) -> bool:
         """Check if this is a leaf node."""
@@ -101,19 +109,65 @@ class BTreeNode:
             child_page = unpack_uint32(self.page_data, offset)
             return key, child_page
     
+    def read_key(self, index: int) -> int:
+        """Read only the key of a cell, leaving its payload undecoded."""
+        return unpack_varint(self.page_data, self.get_cell_offset(index))[0]
+    
+    def read_cells(self) -> List[Tuple[int, Any]]:
+        """
+        Read all cells of the node in one pass.
+        
+        The pointer array is unpacked with a single call and the cells are
+        decoded in a tight loop, for callers that visit every cell.
+        
+        Returns:
+            The cells in key order, as read_cell() returns them
+        """
+        page_data = self.page_data
+        offsets = struct.unpack_from(f'>{self.num_keys}H', page_data, NODE_HEADER_SIZE)
+        cells = []
+        
+        if self.node_type == NODE_TYPE_LEAF:
+            for offset in offsets:
+                key, consumed = unpack_varint(page_data, offset)
+                offset += consumed
+                data_len, consumed = unpack_varint(page_data, offset)
+                offset += consumed
+                cells.append((key, bytes(page_data[offset:offset + data_len])))
+        else:
+            for offset in offsets:
+                key, consumed = unpack_varint(page_data, offset)
+                cells.append((key, unpack_uint32(page_data, offset + consumed)))
+        
+        return cells
+    
     def find_key_index(self, key: int) -> int:
         """
         Find the index where a key should be inserted or is located.
         Uses binary search.
         
+        Each probe decodes only the key varint, never the cell payload. The
+        cell pointer and the one- and two-byte key encodings (keys below
+        16384) are decoded inline, as this loop runs on every level of every
+        lookup; longer keys fall back to unpack_varint.
+        
         Returns:
             Index where key is or should be inserted
         """
+        page_data = self.page_data
         left, right = 0, self.num_keys
         
         while left < right:
             mid = (left + right) // 2
-            mid_key, _ = self.read_cell(mid)
+            pointer = NODE_HEADER_SIZE + mid * 2
+            offset = (page_data[pointer] << 8) | page_data[pointer + 1]
+            mid_key = page_data[offset]
+            if mid_key >= 0x80:
+                second = page_data[offset + 1]
+                if second < 0x80:
+                    mid_key = (mid_key & 0x7F) | (second << 7)
+                else:
+                    mid_key, _ = unpack_varint(page_data, offset)
             
             if mid_key < key:
                 left = mid + 1
@@ -121,6 +175,33 @@ class BTreeNode:
                 right = mid
         
         return left
+    
+    def find_child(self, key: int) -> int:
+        """
+        Find the child page of an internal node whose subtree holds key.
+        
+        Child i holds the keys below cell key i and right_page holds the rest,
+        so the child is at the first separator above key. Keys are integers,
+        which makes that the insertion point of key + 1. Only the child
+        pointer of the chosen cell is decoded.
+        
+        Returns:
+            The child page ID (right_page when key is above every separator)
+        """
+        return self.child_page(self.find_key_index(key + 1))
+    
+    def child_page(self, index: int) -> int:
+        """
+        Get the child page at a position of an internal node.
+        
+        Positions 0..num_keys-1 are the cells' children and num_keys is
+        right_page. Only the child pointer is decoded, not the cell's key.
+        """
+        if index == self.num_keys:
+            return self.right_page
+        offset = unpack_uint16(self.page_data, NODE_HEADER_SIZE + index * 2)
+        _, consumed = unpack_varint(self.page_data, offset)
+        return unpack_uint32(self.page_data, offset + consumed)
 
 
 class BTree:
@@ -143,13 +224,33 @@ class BTree:
         """
         self.pager = pager
         self.logger = get_logger("btree")
+        self._page_size = pager.get_page_size()
+        
+        # Pages modified by the current operation: page_id -> page buffer
+        self._dirty: Dict[int, bytearray] = {}
+        
+        # Leaf the last insert landed in: (page_id, low, high, num_pages), where
+        # the leaf holds keys in [low, high) (None = unbounded) while the pager
+        # has allocated no page since, as every split allocates one
+        self._leaf_hint: Optional[Tuple[int, Optional[int], Optional[int], int]] = None
         
         if root_page is None:
             # Create a new B-tree with a root leaf node
             self.root_page = self._create_leaf_node()
+            self._flush_dirty()
         else:
             self.root_page = root_page
     
+    def _mark_dirty(self, page_id: int, page_data: bytearray) -> None:
+        """Record a modified page; it is written back when the operation ends."""
+        self._dirty[page_id] = page_data
+    
+    def _flush_dirty(self) -> None:
+        """Write each page modified by the operation back to the pager once."""
+        for page_id, page_data in self._dirty.items():
+            self.pager.write_page(page_id, page_data)
+        self._dirty.clear()
+    
     def _create_leaf_node(self) -> int:
         """
         Create a new leaf node.
@@ -157,15 +258,8 @@ class BTree:
         Returns:
             Page ID of the new node
         """
-        page_id = self.pager.allocate_page()
-        page_data = self.pager.read_page(page_id)
-        
-        # Initialize header
-        page_data[0] = NODE_TYPE_LEAF
-        page_data[1:3] = pack_uint16(0)  # num_keys = 0
-        
-        self.pager.write_page(page_id, bytes(page_data))
-        return page_id
+        # The pager hands back a zeroed page, so num_keys = 0 already
+        return self.pager.allocate_page(_LEAF_HEADER)
     
     def _create_internal_node(self) -> int:
         """
@@ -174,16 +268,8 @@ class BTree:
         Returns:
             Page ID of the new node
         """
-        page_id = self.pager.allocate_page()
-        page_data = self.pager.read_page(page_id)
-        
-        # Initialize header
-        page_data[0] = NODE_TYPE_INTERNAL
-        page_data[1:3] = pack_uint16(0)  # num_keys = 0
-        page_data[3:7] = pack_uint32(0)  # right_page = 0
-        
-        self.pager.write_page(page_id, bytes(page_data))
-        return page_id
+        # The pager hands back a zeroed page, so num_keys = 0 and right_page = 0
+        return self.pager.allocate_page(_INTERNAL_HEADER)
     
     def _create_new_root(self, split_key: int, left_page: int, right_page: int) -> None:
         """
@@ -198,7 +284,7 @@ class BTree:
         
         # Load the new root
         page_data = self.pager.read_page(new_root_id)
-        new_root = BTreeNode(new_root_id, page_data, self.pager.get_page_size())
+        new_root = BTreeNode(new_root_id, page_data, self._page_size)
         
         # In our B-tree structure:
         # - The cell at index 0 contains (split_key, left_page)
@@ -214,7 +300,7 @@ class BTree:
 
         # Update root page
         self.root_page = new_root_id
-        self.logger.info(f"Created new root at page {new_root_id}")
+        self.logger.info("Created new root at page %s", new_root_id)
     
     def insert(self, key: int, record: Record) -> None:
         """
@@ -227,28 +313,65 @@ class BTree:
         log_btree_insert(key)
         
         record_data = record.encode()
-        split_result = self._insert_recursive(self.root_page, key, record_data)
+        try:
+            # Ascending inserts keep landing in the same leaf, so try it first
+            if self._insert_into_hinted_leaf(key, record_data):
+                return
+            
+            split_result = self._insert_recursive(self.root_page, key, record_data, None, None)
 
-        # If root was split, create a new root
-        if split_result is not None:
-            split_key, new_page = split_result
-            self._create_new_root(split_key, self.root_page, new_page)
+            # If root was split, create a new root
+            if split_result is not None:
+                split_key, new_page = split_result
+                self._create_new_root(split_key, self.root_page, new_page)
+        finally:
+            self._flush_dirty()
     
-    def _insert_recursive(self, page_id: int, key: int, record_data: bytes) -> Optional[Tuple[int, int]]:
+    def _insert_into_hinted_leaf(self, key: int, record_data: bytes) -> bool:
+        """
+        Insert straight into the leaf of the last insert, skipping the descent.
+        
+        Returns:
+            True if inserted; False if the hint doesn't cover the key or the
+            leaf would need a split, which has to go through its parents
+        """
+        hint = self._leaf_hint
+        if hint is None:
+            return False
+        page_id, low, high, num_pages = hint
+        if (num_pages != self.pager.num_pages or (low is not None and key < low)
+                or (high is not None and key >= high)):
+            return False
+        
+        node = BTreeNode(page_id, self.pager.read_page(page_id), self._page_size)
+        cell_size = bytes_required_varint(key) + bytes_required_varint(len(record_data)) + len(record_data)
+        if self._needs_split(node, cell_size):
+            return False
+        
+        self._insert_into_leaf(node, key, record_data)
+        return True
+    
+    def _insert_recursive(self, page_id: int, key: int, record_data: bytes,
+                          low: Optional[int], high: Optional[int]) -> Optional[Tuple[int, int]]:
         """
         Recursively insert into the B-tree.
         
+        low and high bound the keys of the subtree at page_id, as [low, high).
+        
         Returns:
             None if no split occurred
             (split_key, new_page_id) if node was split
         """
         page_data = self.pager.read_page(page_id)
-        node = BTreeNode(page_id, page_data, self.pager.get_page_size())
+        node = BTreeNode(page_id, page_data, self._page_size)
         
         if node.is_leaf():
-            return self._insert_into_leaf(node, key, record_data)
+            split_result = self._insert_into_leaf(node, key, record_data)
+            # Remember the leaf for the next insert; a split changes its range
+            self._leaf_hint = None if split_result else (page_id, low, high, self.pager.num_pages)
+            return split_result
         else:
-            return self._insert_into_internal(node, key, record_data)
+            return self._insert_into_internal(node, key, record_data, low, high)
     
     def _insert_into_leaf(self, node: BTreeNode, key: int, record_data: bytes) -> Optional[Tuple[int, int]]:
         """
@@ -261,41 +384,45 @@ class BTree:
         insert_idx = node.find_key_index(key)
         
         # Check if key already exists
-        if insert_idx < node.num_keys:
-            existing_key, _ = node.read_cell(insert_idx)
-            if existing_key == key:
-                # Update existing record
-                self._update_leaf_cell(node, insert_idx, key, record_data)
+        if insert_idx < node.num_keys and node.read_key(insert_idx) == key:
+            # Update existing record
+            if self._update_leaf_cell(node, insert_idx, key, record_data):
                 return None
+            # The grown record needs a split: drop the old cell and insert afresh
+            self._delete_cell(node, insert_idx)
         
         # Calculate cell size
-        cell_size = len(pack_varint(key)) + len(pack_varint(len(record_data))) + len(record_data)
+        cell_size = bytes_required_varint(key) + bytes_required_varint(len(record_data)) + len(record_data)
         
-        # Check if we need to split
-        if self._needs_split(node, cell_size):
+        # Check if we need to split, unless packing the live cells frees enough room
+        if self._needs_split(node, cell_size) and not self._compact_leaf(node, cell_size):
             return self._split_leaf(node, key, record_data, insert_idx)
         
         # Insert into node
         self._insert_leaf_cell(node, insert_idx, key, record_data)
         return None
     
-    def _insert_into_internal(self, node: BTreeNode, key: int, record_data: bytes) -> Optional[Tuple[int, int]]:
+    def _insert_into_internal(self, node: BTreeNode, key: int, record_data: bytes,
+                              low: Optional[int], high: Optional[int]) -> Optional[Tuple[int, int]]:
         """
-        Insert into an internal node.
+        Insert into an internal node whose keys lie in [low, high).
 
         Returns:
             None if no split, or (split_key, new_page_id) if split
         """
-        # Find which child to descend to
-        insert_idx = node.find_key_index(key)
+        # Find which child to descend to; a key equal to a separator lives
+        # in the subtree to its right, as in find_child()
+        insert_idx = node.find_key_index(key + 1)
+        child_page = node.child_page(insert_idx)
 
+        # The child's keys lie between the separators on either side of it
+        if insert_idx > 0:
+            low = node.read_key(insert_idx - 1)
         if insert_idx < node.num_keys:
-            _, child_page = node.read_cell(insert_idx)
-        else:
-            child_page = node.right_page
+            high = node.read_key(insert_idx)
 
         # Recursively insert into child
-        split_result = self._insert_recursive(child_page, key, record_data)
+        split_result = self._insert_recursive(child_page, key, record_data, low, high)
 
         if split_result is None:
             return None
@@ -318,12 +445,13 @@ class BTree:
         # Write cell data
         cell_offset = free_offset - len(cell_data)
         node.page_data[cell_offset:cell_offset + len(cell_data)] = cell_data
+        node.free_offset = cell_offset
         
         # Shift cell pointers to make room
         pointer_start = NODE_HEADER_SIZE
-        for i in range(node.num_keys, index, -1):
-            old_offset = unpack_uint16(node.page_data, pointer_start + (i - 1) * 2)
-            node.page_data[pointer_start + i * 2:pointer_start + i * 2 + 2] = pack_uint16(old_offset)
+        src = pointer_start + index * 2
+        end = pointer_start + node.num_keys * 2
+        node.page_data[src + 2:end + 2] = node.page_data[src:end]
         
         # Write new cell pointer
         node.page_data[pointer_start + index * 2:pointer_start + index * 2 + 2] = pack_uint16(cell_offset)
@@ -333,51 +461,113 @@ class BTree:
         node.page_data[1:3] = pack_uint16(node.num_keys)
         
         # Write back to pager
-        self.pager.write_page(node.page_id, bytes(node.page_data))
+        self._mark_dirty(node.page_id, node.page_data)
+    
+    def _write_cells(self, node: BTreeNode, cells: List[bytes]) -> None:
+        """
+        Replace all of a node's cells with the given encoded cells.
+        
+        The cells are packed down from the end of the page and the pointer
+        array is written in one go, giving the same layout as inserting them
+        one by one in order.
+        """
+        offsets = []
+        offset = self._page_size
+        for cell in cells:
+            offset -= len(cell)
+            offsets.append(offset)
+        
+        node.page_data[offset:self._page_size] = b''.join(reversed(cells))
+        pointers = b''.join(pack_uint16(cell_offset) for cell_offset in offsets)
+        node.page_data[NODE_HEADER_SIZE:NODE_HEADER_SIZE + len(pointers)] = pointers
+        
+        node.num_keys = len(cells)
+        node.page_data[1:3] = pack_uint16(node.num_keys)
+        node.free_offset = offset if cells else None
+        self._mark_dirty(node.page_id, node.page_data)
     
-    def _update_leaf_cell(self, node: BTreeNode, index: int, key: int, record_data: bytes) -> None:
-        """Update an existing cell in a leaf node."""
-        # For simplicity, we'll delete and re-insert
-        # In a production system, you'd check if the new record fits in the same space
+    def _update_leaf_cell(self, node: BTreeNode, index: int, key: int, record_data: bytes) -> bool:
+        """
+        Update an existing cell in a leaf node.
+        
+        A record that fits in the space of the old one overwrites it in place.
+        A larger one is written to free space and the old cell dropped.
+        
+        Returns:
+            False, leaving the node untouched, if the node would need a split
+        """
+        offset = node.get_cell_offset(index)
+        key_size = bytes_required_varint(key)
+        old_len, len_size = unpack_varint(node.page_data, offset + key_size)
+        cell = pack_varint(key) + pack_varint(len(record_data)) + record_data
+        
+        if len(cell) <= key_size + len_size + old_len:
+            node.page_data[offset:offset + len(cell)] = cell
+            self._mark_dirty(node.page_id, node.page_data)
+            return True
+        
+        if self._needs_split(node, len(cell)):
+            return False
         self._delete_cell(node, index)
         self._insert_leaf_cell(node, index, key, record_data)
+        return True
     
     def _delete_cell(self, node: BTreeNode, index: int) -> None:
         """Delete a cell from a node."""
         # Shift cell pointers
         pointer_start = NODE_HEADER_SIZE
-        for i in range(index, node.num_keys - 1):
-            offset = unpack_uint16(node.page_data, pointer_start + (i + 1) * 2)
-            node.page_data[pointer_start + i * 2:pointer_start + i * 2 + 2] = pack_uint16(offset)
+        dst = pointer_start + index * 2
+        end = pointer_start + node.num_keys * 2
+        node.page_data[dst:end - 2] = node.page_data[dst + 2:end]
         
         # Update num_keys
         node.num_keys -= 1
         node.page_data[1:3] = pack_uint16(node.num_keys)
+        node.free_offset = None
+    
+    def _compact_leaf(self, node: BTreeNode, new_cell_size: int) -> bool:
+        """
+        Pack a leaf's live cells together if that makes room for a new cell.
+        
+        Deleted and outgrown cells leave dead space behind in the page, which
+        counts as used until the page is rewritten. Reclaiming it lets the
+        insert go ahead in this page instead of splitting it.
+        
+        Returns:
+            True if the node was compacted and now has room for the cell
+        """
+        if node.num_keys + 1 > 100:
+            return False
+        
+        cells = [pack_varint(k) + pack_varint(len(data)) + data for k, data in node.read_cells()]
+        live_space = NODE_HEADER_SIZE + (node.num_keys * 2) + sum(len(cell) for cell in cells)
+        if live_space + 2 + new_cell_size > (self._page_size * 3 // 4):
+            return False
+        
+        self._write_cells(node, cells)
+        return True
     
     def _needs_split(self, node: BTreeNode, new_cell_size: int) -> bool:
         """Check if a node needs to be split before inserting a new cell."""
         # Simple heuristic: split if more than 75% full or too many keys
         used_space = self._calculate_used_space(node)
-        return used_space + new_cell_size > (self.pager.get_page_size() * 3 // 4) or node.num_keys >= 100
+        return used_space + new_cell_size > (self._page_size * 3 // 4) or node.num_keys >= 100
     
     def _calculate_used_space(self, node: BTreeNode) -> int:
         """Calculate how much space is used in a node."""
         # Header + cell pointer array + cells
-        return NODE_HEADER_SIZE + (node.num_keys * 2) + (self.pager.get_page_size() - self._find_free_space(node))
+        return NODE_HEADER_SIZE + (node.num_keys * 2) + (self._page_size - self._find_free_space(node))
     
     def _find_free_space(self, node: BTreeNode) -> int:
         """Find the offset where free space begins (working backwards from end)."""
         if node.num_keys == 0:
-            return self.pager.get_page_size()
+            return self._page_size
         
-        # Find the minimum cell offset
-        min_offset = self.pager.get_page_size()
-        for i in range(node.num_keys):
-            offset = self.get_cell_offset(node, i)
-            if offset < min_offset:
-                min_offset = offset
-        
-        return min_offset
+        # Find the minimum cell offset once per node, unpacking the whole
+        # pointer array in one call
+        if node.free_offset is None:
+            node.free_offset = min(struct.unpack_from(f'>{node.num_keys}H', node.page_data, NODE_HEADER_SIZE))
+        return node.free_offset
     
     def get_cell_offset(self, node: BTreeNode, index: int) -> int:
         """Get cell offset (wrapper for node method)."""
@@ -396,33 +586,23 @@ class BTree:
         new_page_id = self._create_leaf_node()
         
         # Collect all keys and data including the new one
-        all_cells = []
-        for i in range(node.num_keys):
-            k, data = node.read_cell(i)
-            all_cells.append((k, data))
-        
+        all_cells = node.read_cells()
         all_cells.insert(insert_idx, (key, record_data))
         
         # Split point (middle)
         split_point = len(all_cells) // 2
         
-        # Clear original node
-        node.num_keys = 0
-        node.page_data[1:3] = pack_uint16(0)
-        
-        # Insert first half into original node
-        for i in range(split_point):
-            k, data = all_cells[i]
-            self._insert_leaf_cell(node, i, k, data)
+        # Lay out the first half in the original node
+        self._write_cells(node, [pack_varint(k) + pack_varint(len(data)) + data
+                                 for k, data in all_cells[:split_point]])
         
         # Load new node
         new_page_data = self.pager.read_page(new_page_id)
-        new_node = BTreeNode(new_page_id, new_page_data, self.pager.get_page_size())
+        new_node = BTreeNode(new_page_id, new_page_data, self._page_size)
         
-        # Insert second half into new node
-        for i in range(split_point, len(all_cells)):
-            k, data = all_cells[i]
-            self._insert_leaf_cell(new_node, i - split_point, k, data)
+        # Lay out the second half in the new node
+        self._write_cells(new_node, [pack_varint(k) + pack_varint(len(data)) + data
+                                     for k, data in all_cells[split_point:]])
         
         # Return the first key of the new node as split key
         split_key, _ = all_cells[split_point]
@@ -468,7 +648,7 @@ class BTree:
             # Now right_page should point to right_child
             node.page_data[3:7] = pack_uint32(right_child)
             node.right_page = right_child
-            self.pager.write_page(node.page_id, bytes(node.page_data))
+            self._mark_dirty(node.page_id, node.page_data)
 
         return None
     
@@ -479,12 +659,13 @@ class BTree:
         free_offset = self._find_free_space(node)
         cell_offset = free_offset - len(cell_data)
         node.page_data[cell_offset:cell_offset + len(cell_data)] = cell_data
+        node.free_offset = cell_offset
 
         # Shift cell pointers
         pointer_start = NODE_HEADER_SIZE
-        for i in range(node.num_keys, index, -1):
-            old_offset = unpack_uint16(node.page_data, pointer_start + (i - 1) * 2)
-            node.page_data[pointer_start + i * 2:pointer_start + i * 2 + 2] = pack_uint16(old_offset)
+        src = pointer_start + index * 2
+        end = pointer_start + node.num_keys * 2
+        node.page_data[src + 2:end + 2] = node.page_data[src:end]
 
         # Write new cell pointer
         node.page_data[pointer_start + index * 2:pointer_start + index * 2 + 2] = pack_uint16(cell_offset)
@@ -493,7 +674,7 @@ class BTree:
         node.num_keys += 1
         node.page_data[1:3] = pack_uint16(node.num_keys)
 
-        self.pager.write_page(node.page_id, bytes(node.page_data))
+        self._mark_dirty(node.page_id, node.page_data)
 
     def _update_internal_cell_child(self, node: BTreeNode, index: int, new_child_page: int) -> None:
         """Update the child page pointer in an internal cell."""
@@ -507,7 +688,7 @@ class BTree:
         child_offset = cell_offset + key_bytes
         node.page_data[child_offset:child_offset + 4] = pack_uint32(new_child_page)
 
-        self.pager.write_page(node.page_id, bytes(node.page_data))
+        self._mark_dirty(node.page_id, node.page_data)
     
     def _split_internal(self, node: BTreeNode, key: int, left_child: int, right_child: int, insert_idx: int, child_idx: int) -> Tuple[int, int]:
         """
@@ -526,10 +707,7 @@ class BTree:
         new_page_id = self._create_internal_node()
 
         # Collect all cells
-        all_cells = []
-        for i in range(node.num_keys):
-            k, child = node.read_cell(i)
-            all_cells.append((k, child))
+        all_cells = node.read_cells()
 
         # Save old_right_page before modification
         old_right_page = node.right_page
@@ -548,34 +726,27 @@ class BTree:
 
         split_point = len(all_cells) // 2
 
-        # Clear and rebuild nodes
-        node.num_keys = 0
-        node.page_data[1:3] = pack_uint16(0)
-
-        # Insert first half into left node (original)
-        for i in range(split_point):
-            k, child = all_cells[i]
-            self._insert_internal_cell(node, i, k, child)
+        # Rebuild the first half into the left node (original)
+        self._write_cells(node, [pack_varint(k) + pack_uint32(child)
+                                 for k, child in all_cells[:split_point]])
 
         # The split key's child becomes the right_page of the left node
         split_key, split_child = all_cells[split_point]
         node.page_data[3:7] = pack_uint32(split_child)
         node.right_page = split_child
-        self.pager.write_page(node.page_id, bytes(node.page_data))
 
         # Load new node
         new_page_data = self.pager.read_page(new_page_id)
-        new_node = BTreeNode(new_page_id, new_page_data, self.pager.get_page_size())
+        new_node = BTreeNode(new_page_id, new_page_data, self._page_size)
 
-        # Insert second half into right node (new)
-        for i in range(split_point + 1, len(all_cells)):
-            k, child = all_cells[i]
-            self._insert_internal_cell(new_node, i - split_point - 1, k, child)
+        # Lay out the second half in the right node (new)
+        self._write_cells(new_node, [pack_varint(k) + pack_uint32(child)
+                                     for k, child in all_cells[split_point + 1:]])
 
         # Transfer the old right_page to the new node
         new_node.page_data[3:7] = pack_uint32(old_right_page if old_right_page else 0)
         new_node.right_page = old_right_page
-        self.pager.write_page(new_page_id, bytes(new_node.page_data))
+        self._mark_dirty(new_page_id, new_node.page_data)
 
         return split_key, new_page_id
     
@@ -590,51 +761,37 @@ class BTree:
             The record if found, None otherwise
         """
         log_btree_search(key)
-        return self._search_recursive(self.root_page, key)
+        node = self._find_leaf(key)
+        if node is None:
+            return None
+        
+        idx = node.find_key_index(key)
+        if idx < node.num_keys:
+            # Decode the record straight out of the leaf page, as the scan
+            # does, rather than copying its payload out first
+            offset = node.get_cell_offset(idx)
+            found_key, consumed = unpack_varint(node.page_data, offset)
+            if found_key == key:
+                offset += consumed
+                data_len, consumed = unpack_varint(node.page_data, offset)
+                offset += consumed
+                return Record.decode(node.page_data, offset, offset + data_len)
+        return None
     
-    def _search_recursive(self, page_id: int, key: int) -> Optional[Record]:
-        """Recursively search for a key."""
-        page_data = self.pager.read_page(page_id)
-        node = BTreeNode(page_id, page_data, self.pager.get_page_size())
+    def _find_leaf(self, key: int) -> Optional[BTreeNode]:
+        """
+        Walk down from the root to the leaf whose key range holds key.
         
-        if node.is_leaf():
-            # Find the key in leaf node
-            idx = node.find_key_index(key)
-            if idx < node.num_keys:
-                found_key, record_data = node.read_cell(idx)
-                if found_key == key:
-                    return Record.decode(record_data)
-            return None
-        else:
-            # Internal node - find which child to descend to
-            idx = node.find_key_index(key)
-
-            # In our B-tree structure:
-            # cell[i] = (key[i], child[i]) where child[i] contains keys < key[i]
-            # right_page contains keys >= key[last]
-
-            # If idx < num_keys, cell[idx].key >= search_key
-            if idx < node.num_keys:
-                separator_key, child_page = node.read_cell(idx)
-
-                # If search key < separator key, go to left child
-                if key < separator_key:
-                    return self._search_recursive(child_page, key)
-                # If search key >= separator key, go to right subtree
-                # (either next cell's child or right_page)
-                elif idx + 1 < node.num_keys:
-                    _, next_child_page = node.read_cell(idx + 1)
-                    return self._search_recursive(next_child_page, key)
-                else:
-                    # No more cells, go to right_page
-                    if node.right_page and node.right_page > 0:
-                        return self._search_recursive(node.right_page, key)
-                    return None
-            else:
-                # Key is greater than all keys in this node
-                # Go to the rightmost child
-                if node.right_page and node.right_page > 0:
-                    return self._search_recursive(node.right_page, key)
+        Returns:
+            The leaf node, or None if the tree has no child for the key
+        """
+        page_id = self.root_page
+        while True:
+            node = BTreeNode(page_id, self.pager.read_page(page_id), self._page_size)
+            if node.is_leaf():
+                return node
+            page_id = node.find_child(key)
+            if not page_id:
                 return None
     
     def scan(self) -> List[Tuple[int, Record]]:
@@ -644,31 +801,66 @@ class BTree:
         Returns:
             List of (key, record) tuples in ascending key order
         """
-        results = []
-        self._scan_recursive(self.root_page, results)
-        return results
+        return list(self.iter_scan())
     
-    def _scan_recursive(self, page_id: int, results: List[Tuple[int, Record]]) -> None:
-        """Recursively scan the tree."""
-        page_data = self.pager.read_page(page_id)
-        node = BTreeNode(page_id, page_data, self.pager.get_page_size())
-
-
-        if node.is_leaf():
-            # Add all records from this leaf
-            for i in range(node.num_keys):
-                key, record_data = node.read_cell(i)
-                record = Record.decode(record_data)
-                results.append((key, record))
-        else:
-            # Internal node - scan children in order
-            for i in range(node.num_keys):
-                key, child_page = node.read_cell(i)
-                self._scan_recursive(child_page, results)
-
-            # Don't forget the rightmost child
+    def iter_scan(self) -> Iterator[Tuple[int, Record]]:
+        """
+        Lazily scan all key-record pairs in order.
+        
+        Pages are read and records decoded only as the iterator advances, so
+        callers that filter rows never hold the whole table in memory. The
+        tree must not be modified while the iterator is in use.
+        
+        Yields:
+            (key, record) tuples in ascending key order
+        """
+        return self._scan_tree()
+    
+    def iter_keys(self) -> Iterator[int]:
+        """
+        Lazily scan all keys in order, without decoding any record.
+        
+        For callers that only need the keys, such as a DELETE of every row.
+        The tree must not be modified while the iterator is in use.
+        
+        Yields:
+            Keys in ascending order
+        """
+        for node in self._scan_leaves():
+            page_data = node.page_data
+            for offset in struct.unpack_from(f'>{node.num_keys}H', page_data, NODE_HEADER_SIZE):
+                yield unpack_varint(page_data, offset)[0]
+    
+    def _scan_tree(self) -> Iterator[Tuple[int, Record]]:
+        """Yield the records of each leaf in turn, decoding each one in place."""
+        for node in self._scan_leaves():
+            page_data = node.page_data
+            for offset in struct.unpack_from(f'>{node.num_keys}H', page_data, NODE_HEADER_SIZE):
+                key, consumed = unpack_varint(page_data, offset)
+                offset += consumed
+                data_len, consumed = unpack_varint(page_data, offset)
+                offset += consumed
+                yield key, Record.decode(page_data, offset, offset + data_len)
+    
+    def _scan_leaves(self) -> Iterator[BTreeNode]:
+        """Walk the tree depth-first with an explicit stack, yielding leaves in key order."""
+        pending = [self.root_page]
+        while pending:
+            page_id = pending.pop()
+            node = BTreeNode(page_id, self.pager.read_page(page_id), self._page_size)
+            
+            if node.is_leaf():
+                yield node
+                continue
+            
+            # Internal node - visit children in order, rightmost child last
+            children = [child_page for _, child_page in node.read_cells()]
             if node.right_page:
-                self._scan_recursive(node.right_page, results)
+                children.append(node.right_page)
+            
+            # Load the children in batched reads before visiting them
+            self.pager.prefetch(children)
+            pending.extend(reversed(children))
     
     def get_root_page(self) -> int:
         """Get the root page ID."""
@@ -684,42 +876,98 @@ class BTree:
         Returns:
             True if deleted, False if key not found
         """
-        return self._delete_recursive(self.root_page, key)
+        try:
+            return self._delete_key(key)
+        finally:
+            self._flush_dirty()
     
-    def _delete_recursive(self, page_id: int, key: int) -> bool:
+    def _delete_key(self, key: int) -> bool:
         """
-        Recursively delete a key from the B-tree.
+        Delete a key from the leaf that holds it.
         
         Returns:
             True if key was found and deleted
         """
+        node = self._find_leaf(key)
+        if node is None:
+            return False
+        
+        idx = node.find_key_index(key)
+        if idx < node.num_keys:
+            found_key = node.read_key(idx)
+            if found_key == key:
+                # Delete this cell
+                self._delete_cell(node, idx)
+                self._mark_dirty(node.page_id, node.page_data)
+                return True
+        
+        return False
+    
+    def delete_many(self, keys: List[int]) -> int:
+        """
+        Delete several keys from the B-tree in a single pass.
+        
+        The sorted keys are partitioned across children on the way down, so
+        each page is read once and each affected leaf is rewritten once,
+        instead of one root-to-leaf walk and page write per key.
+        
+        Args:
+            keys: The keys to delete, in ascending order
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        try:
+            return self._delete_many_recursive(self.root_page, keys, 0, len(keys))
+        finally:
+            self._flush_dirty()
+    
+    def _delete_many_recursive(self, page_id: int, keys: List[int], lo: int, hi: int) -> int:
+        """Delete keys[lo:hi] from the subtree rooted at page_id."""
         page_data = self.pager.read_page(page_id)
-        node = BTreeNode(page_id, page_data, self.pager.get_page_size())
+        node = BTreeNode(page_id, page_data, self._page_size)
         
         if node.is_leaf():
-            # Find the key
-            idx = node.find_key_index(key)
-            
-            if idx < node.num_keys:
-                found_key, _ = node.read_cell(idx)
-                if found_key == key:
-                    # Delete this cell
-                    self._delete_cell(node, idx)
-                    self.pager.write_page(node.page_id, bytes(node.page_data))
-                    return True
-            
-            return False
-        else:
-            # Internal node - find which child to descend to
-            idx = node.find_key_index(key)
-            
-            if idx < node.num_keys:
-                _, child_page = node.read_cell(idx)
-                return self._delete_recursive(child_page, key)
-            else:
-                if node.right_page and node.right_page > 0:
-                    return self._delete_recursive(node.right_page, key)
-                return False
+            # Two-pointer merge of the cells against the sorted keys,
+            # keeping the pointers of the surviving cells
+            kept = []
+            pos = lo
+            for i in range(node.num_keys):
+                cell_key = node.read_key(i)
+                while pos < hi and keys[pos] < cell_key:
+                    pos += 1
+                if pos < hi and keys[pos] == cell_key:
+                    pos += 1
+                    continue
+                kept.append(node.get_cell_offset(i))
+        
+            deleted = node.num_keys - len(kept)
+            if deleted:
+                # Rewrite the cell pointer array and key count in one go
+                pointers = b''.join(pack_uint16(offset) for offset in kept)
+                node.page_data[NODE_HEADER_SIZE:NODE_HEADER_SIZE + len(pointers)] = pointers
+                node.num_keys = len(kept)
+                node.page_data[1:3] = pack_uint16(node.num_keys)
+                self._mark_dirty(node.page_id, node.page_data)
+            return deleted
+        
+        # Internal node - child i holds the keys below cell key i,
+        # right_page holds the rest
+        deleted = 0
+        for i in range(node.num_keys):
+            if lo >= hi:
+                return deleted
+            cell_key, child_page = node.read_cell(i)
+            split = bisect_left(keys, cell_key, lo, hi)
+            if split > lo:
+                deleted += self._delete_many_recursive(child_page, keys, lo, split)
+                lo = split
+        
+        if lo < hi and node.right_page:
+            deleted += self._delete_many_recursive(node.right_page, keys, lo, hi)
+        return deleted
     
     def update(self, key: int, record: Record) -> bool:
         """
@@ -732,8 +980,95 @@ class BTree:
         Returns:
             True if updated, False if key not found
         """
-        # Simple implementation: delete then insert
-        if self._delete_recursive(self.root_page, key):
-            self.insert(key, record)
-            return True
-        return False
\ No newline at end of file
+        record_data = record.encode()
+        try:
+            node = self._find_leaf(key)
+            if node is None:
+                return False
+            
+            idx = node.find_key_index(key)
+            if idx >= node.num_keys or node.read_key(idx) != key:
+                return False
+            
+            if self._update_leaf_cell(node, idx, key, record_data):
+                return True
+        finally:
+            self._flush_dirty()
+        
+        # Splitting the leaf needs the path from the root, so go through insert
+        self.insert(key, record)
+        return True
+    
+    def update_many(self, updates: List[Tuple[int, Record]]) -> int:
+        """
+        Update several records in a single pass.
+        
+        Records are updated in their leaf during one walk of the tree,
+        writing each affected leaf once. Records whose leaf would have to be
+        split are then deleted together and re-inserted.
+        
+        Args:
+            updates: (key, record) pairs, in ascending key order
+        
+        Returns:
+            Number of records updated
+        """
+        if not updates:
+            return 0
+        keys = [key for key, _ in updates]
+        encoded = [record.encode() for _, record in updates]
+        misfits: List[int] = []
+        try:
+            updated = self._update_many_recursive(self.root_page, keys, encoded, 0, len(keys), misfits)
+        finally:
+            self._flush_dirty()
+        
+        if misfits:
+            updated += self.delete_many([keys[i] for i in misfits])
+            for i in misfits:
+                self.insert(keys[i], updates[i][1])
+        return updated
+    
+    def _update_many_recursive(self, page_id: int, keys: List[int], encoded: List[bytes],
+                               lo: int, hi: int, misfits: List[int]) -> int:
+        """
+        Overwrite the cells for keys[lo:hi] in the subtree rooted at page_id.
+        
+        Positions of records that need their leaf split are appended to misfits.
+        """
+        page_data = self.pager.read_page(page_id)
+        node = BTreeNode(page_id, page_data, self._page_size)
+        
+        if node.is_leaf():
+            updated = 0
+            pos = lo
+            for i in range(node.num_keys):
+                if pos >= hi:
+                    break
+                cell_key = node.read_key(i)
+                while pos < hi and keys[pos] < cell_key:
+                    pos += 1
+                if pos >= hi or keys[pos] != cell_key:
+                    continue
+                
+                if self._update_leaf_cell(node, i, cell_key, encoded[pos]):
+                    updated += 1
+                else:
+                    misfits.append(pos)
+                pos += 1
+            return updated
+        
+        # Internal node - partition the keys across children as in delete_many
+        updated = 0
+        for i in range(node.num_keys):
+            if lo >= hi:
+                return updated
+            cell_key, child_page = node.read_cell(i)
+            split = bisect_left(keys, cell_key, lo, hi)
+            if split > lo:
+                updated += self._update_many_recursive(child_page, keys, encoded, lo, split, misfits)
+                lo = split
+        
+        if lo < hi and node.right_page:
+            updated += self._update_many_recursive(node.right_page, keys, encoded, lo, hi, misfits)
+        return updated
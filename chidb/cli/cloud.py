@@ -12,6 +12,7 @@ Provides subcommands for managing cloud databases:
 
 import argparse
 import getpass
+import gzip
 import importlib.util
 import json
 import os
@@ -25,17 +26,27 @@ except ImportError:
 
 from chidb.client import (
     CloudConnection,
-    ExecuteResult,
+    configure_session,
     load_credentials,
+    read_json_file,
     save_credentials,
+    write_json_file,
+    write_text_file,
     CREDENTIALS_PATH,
 )
+from chidb.cli.shell import setup_readline
 from chidb.schema import Table, collect_tables
 
 
 DEFAULT_SERVER_URL = "https://yesdb.centralindia.cloudapp.azure.com"
 PROJECT_CONFIG_FILE = os.path.join("yesdb", ".yesdb.json")
 
+# Request bodies smaller than this are sent uncompressed
+GZIP_MIN_SIZE = 1024
+
+# Shared HTTP session, created on first use by _session()
+_SESSION = None
+
 
 # ── Helpers ──────────────────────────────────────────────────────
 
@@ -52,6 +63,19 @@ def _require_requests() -> bool:
     return True
 
 
+def _session():
+    """
+    Get the HTTP session shared by every request of this CLI run.
+
+    Reusing one session keeps connections to the server alive, so only the
+    first request pays for the TCP and TLS handshakes.
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = configure_session(requests.Session())
+    return _SESSION
+
+
 def _get_server_url() -> str:
     """Get the server URL from credentials or use default."""
     try:
@@ -63,25 +87,51 @@ def _get_server_url() -> str:
 
 def _load_project_config() -> Optional[dict]:
     """Load project config from yesdb/.yesdb.json in the current directory. Returns None if not found."""
-    if not os.path.exists(PROJECT_CONFIG_FILE):
+    try:
+        return read_json_file(PROJECT_CONFIG_FILE)
+    except FileNotFoundError:
         print(
             "Error: No yesdb project found in this directory.\n"
             "Run 'yesdb init <db_name>' first.",
             file=sys.stderr,
         )
         return None
-    with open(PROJECT_CONFIG_FILE, "r") as f:
-        return json.load(f)
+
+
+LOG_FORMAT = "  {timestamp} - chidb.{component} - {level} - {message}"
+
+_LOG_DEFAULTS = {"level": "INFO", "component": "unknown", "timestamp": "", "message": ""}
+
+
+class _LogFields(dict):
+    """A log entry that fills in defaults for the fields the server left out."""
+
+    def __missing__(self, key):
+        return _LOG_DEFAULTS.get(key, "")
 
 
 def _print_logs(logs: list):
     """Pretty-print engine logs."""
-    for log in logs:
-        level = log.get("level", "INFO")
-        component = log.get("component", "unknown")
-        message = log.get("message", "")
-        timestamp = log.get("timestamp", "")
-        print(f"  {timestamp} - chidb.{component} - {level} - {message}")
+    if not logs:
+        return
+    sys.stdout.write("\n".join(LOG_FORMAT.format_map(_LogFields(log)) for log in logs) + "\n")
+    sys.stdout.flush()
+
+
+def _prompt(label: str, secret: bool = False) -> str:
+    """
+    Read one line of user input.
+
+    On a terminal this is input(), or getpass() for secrets. Piped input is
+    read straight from stdin so scripts never go through termios; like
+    input(), EOFError is raised at end of input.
+    """
+    if not sys.stdin.isatty():
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+    return getpass.getpass(label) if secret else input(label)
 
 
 # ── Commands ─────────────────────────────────────────────────────
@@ -92,17 +142,17 @@ def cmd_signup(args) -> int:
     if not _require_requests():
         return 1
 
-    email = input("Email: ").strip()
+    email = _prompt("Email: ").strip()
     if not email:
         print("Error: Email cannot be empty.", file=sys.stderr)
         return 1
 
-    password = getpass.getpass("Password: ")
+    password = _prompt("Password: ", secret=True)
     if not password:
         print("Error: Password cannot be empty.", file=sys.stderr)
         return 1
 
-    confirm = getpass.getpass("Confirm password: ")
+    confirm = _prompt("Confirm password: ", secret=True)
     if password != confirm:
         print("Error: Passwords do not match.", file=sys.stderr)
         return 1
@@ -114,7 +164,7 @@ def cmd_signup(args) -> int:
         body = {"email": email, "password": password}
         if name:
             body["name"] = name
-        resp = requests.post(f"{server_url}/api/v1/signup", json=body)
+        resp = _session().post(f"{server_url}/api/v1/signup", json=body)
 
         if resp.status_code == 409:
             print("Error: Email already registered.", file=sys.stderr)
@@ -130,6 +180,9 @@ def cmd_signup(args) -> int:
         print(f"  Credentials saved to {CREDENTIALS_PATH}")
         return 0
 
+    except requests.Timeout:
+        print(f"Error: Server at {server_url} did not respond in time", file=sys.stderr)
+        return 1
     except requests.ConnectionError:
         print(f"Error: Could not connect to server at {server_url}", file=sys.stderr)
         return 1
@@ -143,12 +196,12 @@ def cmd_login(args) -> int:
     if not _require_requests():
         return 1
 
-    email = input("Email: ").strip()
+    email = _prompt("Email: ").strip()
     if not email:
         print("Error: Email cannot be empty.", file=sys.stderr)
         return 1
 
-    password = getpass.getpass("Password: ")
+    password = _prompt("Password: ", secret=True)
     if not password:
         print("Error: Password cannot be empty.", file=sys.stderr)
         return 1
@@ -156,7 +209,7 @@ def cmd_login(args) -> int:
     server_url = args.server or _get_server_url()
 
     try:
-        resp = requests.post(
+        resp = _session().post(
             f"{server_url}/api/v1/login",
             json={"email": email, "password": password},
         )
@@ -175,6 +228,9 @@ def cmd_login(args) -> int:
         print(f"  Credentials saved to {CREDENTIALS_PATH}")
         return 0
 
+    except requests.Timeout:
+        print(f"Error: Server at {server_url} did not respond in time", file=sys.stderr)
+        return 1
     except requests.ConnectionError:
         print(f"Error: Could not connect to server at {server_url}", file=sys.stderr)
         return 1
@@ -205,7 +261,7 @@ def cmd_init(args) -> int:
 
     # Create database on server
     try:
-        resp = requests.post(
+        resp = _session().post(
             f"{server_url}/api/v1/databases",
             json={"name": db_name},
             headers=headers,
@@ -225,6 +281,9 @@ def cmd_init(args) -> int:
             if data.get("logs"):
                 _print_logs(data["logs"])
 
+    except requests.Timeout:
+        print(f"Error: Server at {server_url} did not respond in time", file=sys.stderr)
+        return 1
     except requests.ConnectionError:
         print(f"Error: Could not connect to server at {server_url}", file=sys.stderr)
         return 1
@@ -234,22 +293,21 @@ def cmd_init(args) -> int:
 
     # Write project config
     config = {"database": db_name}
-    with open(PROJECT_CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
+    write_json_file(PROJECT_CONFIG_FILE, config)
 
     # Write schema template if it doesn't exist
     schema_path = os.path.join("yesdb", "schema.py")
     if not os.path.exists(schema_path):
-        with open(schema_path, "w") as f:
-            f.write(
-                "from yesdb import Table, Column, Integer, Text, Real, Blob\n\n"
-                f"# Schema for '{db_name}'. Add your tables below, then run 'yesdb push'.\n\n"
-                "users = Table('users', [\n"
-                "    Column('id', Integer, primary_key=True),\n"
-                "    Column('name', Text),\n"
-                "    Column('email', Text),\n"
-                "])\n"
-            )
+        write_text_file(
+            schema_path,
+            "from yesdb import Table, Column, Integer, Text, Real, Blob\n\n"
+            f"# Schema for '{db_name}'. Add your tables below, then run 'yesdb push'.\n\n"
+            "users = Table('users', [\n"
+            "    Column('id', Integer, primary_key=True),\n"
+            "    Column('name', Text),\n"
+            "    Column('email', Text),\n"
+            "])\n",
+        )
 
     print(f"  Created yesdb/ folder with schema.py")
     print(f"  Project linked to database '{db_name}'.")
@@ -300,13 +358,20 @@ def cmd_push(args) -> int:
     server_url = creds["server_url"]
     api_key = creds["api_key"]
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    push_url = f"{server_url}/api/v1/databases/{db_name}/push"
+    body = json.dumps({"statements": statements}).encode("utf-8")
 
     try:
-        resp = requests.post(
-            f"{server_url}/api/v1/databases/{db_name}/push",
-            json={"statements": statements},
-            headers=headers,
-        )
+        if len(body) < GZIP_MIN_SIZE:
+            resp = _session().post(push_url, data=body, headers=headers)
+        else:
+            # Schema SQL compresses well; a server too old to read a gzip
+            # body rejects it as invalid JSON, so resend it plain
+            resp = _session().post(
+                push_url, data=gzip.compress(body), headers={**headers, "Content-Encoding": "gzip"}
+            )
+            if resp.status_code == 422:
+                resp = _session().post(push_url, data=body, headers=headers)
 
         if resp.status_code == 401:
             print("Error: Invalid API key. Run 'yesdb login' to refresh.", file=sys.stderr)
@@ -331,6 +396,9 @@ def cmd_push(args) -> int:
         print(f"\n  Schema synced. {data['executed']} statement(s) pushed.")
         return 0
 
+    except requests.Timeout:
+        print(f"Error: Server at {server_url} did not respond in time", file=sys.stderr)
+        return 1
     except requests.ConnectionError:
         print(f"Error: Could not connect to server at {server_url}", file=sys.stderr)
         return 1
@@ -355,7 +423,7 @@ def cmd_databases(args) -> int:
     headers = {"Authorization": f"Bearer {api_key}"}
 
     try:
-        resp = requests.get(f"{server_url}/api/v1/databases", headers=headers)
+        resp = _session().get(f"{server_url}/api/v1/databases", headers=headers)
 
         if resp.status_code == 401:
             print("Error: Invalid API key. Run 'yesdb login' to refresh.", file=sys.stderr)
@@ -371,6 +439,9 @@ def cmd_databases(args) -> int:
                 print(f"    - {db}")
         return 0
 
+    except requests.Timeout:
+        print(f"Error: Server at {server_url} did not respond in time", file=sys.stderr)
+        return 1
     except requests.ConnectionError:
         print(f"Error: Could not connect to server at {server_url}", file=sys.stderr)
         return 1
@@ -387,7 +458,7 @@ def cmd_shell(args) -> int:
     db_name = args.db_name
 
     try:
-        conn = CloudConnection(db_name=db_name)
+        conn = CloudConnection(db_name=db_name, session=_session())
     except FileNotFoundError:
         print("Error: Not logged in. Run 'yesdb login' first.", file=sys.stderr)
         return 1
@@ -397,11 +468,12 @@ def cmd_shell(args) -> int:
 
     print(f"  Connected to '{db_name}' (cloud)")
     print("  Enter SQL statements or 'exit' to quit.\n")
+    setup_readline()
 
     try:
         while True:
             try:
-                sql = input(f"yesdb:{db_name}> ").strip()
+                sql = _prompt(f"yesdb:{db_name}> ").strip()
             except (KeyboardInterrupt, EOFError):
                 print("\nGoodbye!")
                 break
@@ -412,22 +484,24 @@ def cmd_shell(args) -> int:
                 print("Goodbye!")
                 break
 
-            if sql.lower() == ".tables":
-                tables = conn.get_table_names()
-                if tables:
-                    for t in tables:
-                        print(f"  {t}")
-                else:
-                    print("  (no tables)")
-                continue
-
             try:
+                if sql.lower() == ".tables":
+                    # The connection caches the list until it goes stale or DDL runs
+                    tables = conn.get_table_names()
+                    if tables:
+                        sys.stdout.write("".join(f"  {t}\n" for t in tables))
+                        sys.stdout.flush()
+                    else:
+                        print("  (no tables)")
+                    continue
+
                 result = conn.execute(sql)
                 if result.rows:
-                    # Print results as a simple table
-                    for row in result.rows:
-                        print(" | ".join(str(v) if v is not None else "NULL" for v in row))
-                    print(f"({result.row_count} row{'s' if result.row_count != 1 else ''})")
+                    # Print results as a simple table, written in one call
+                    lines = [" | ".join("NULL" if v is None else str(v) for v in row) for row in result.rows]
+                    lines.append(f"({result.row_count} row{'s' if result.row_count != 1 else ''})")
+                    sys.stdout.write("\n".join(lines) + "\n")
+                    sys.stdout.flush()
                 else:
                     print("Query executed.")
 
@@ -437,6 +511,8 @@ def cmd_shell(args) -> int:
 
             except (PermissionError, ValueError) as e:
                 print(f"Error: {e}")
+            except requests.Timeout:
+                print("Error: Server did not respond in time")
 
     finally:
         conn.close()
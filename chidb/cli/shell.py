@@ -3,10 +3,71 @@ Interactive shell for ChiDB.
 Provides a command-line interface for database interaction.
 """
 
+import atexit
+import os
 import sys
 import argparse
+from itertools import zip_longest
 from typing import Optional
 from chidb.api import YesDB
+from chidb.record import Record
+from chidb.sql.lexer import Lexer, KEYWORDS
+from chidb.sql.parser import Parser, SelectStatement
+
+try:
+    import readline
+except ImportError:
+    # Not available on Windows; input() falls back to its plain line editor
+    readline = None
+
+
+# Where interactive shells keep their input history
+HISTORY_FILE = os.path.expanduser("~/.yesdb_history")
+HISTORY_LENGTH = 1000
+
+# Words offered by tab completion
+_COMPLETIONS = sorted(KEYWORDS)
+
+_readline_ready = False
+
+
+def _complete_sql(text: str, state: int) -> Optional[str]:
+    """readline completer: the state-th SQL keyword starting with text."""
+    prefix = text.upper()
+    matches = [word + ' ' for word in _COMPLETIONS if word.startswith(prefix)]
+    return matches[state] if state < len(matches) else None
+
+
+def _save_history(history_file: str) -> None:
+    """Write the input history, ignoring an unwritable history file."""
+    try:
+        readline.write_history_file(history_file)
+    except OSError:
+        pass
+
+
+def setup_readline(history_file: str = HISTORY_FILE) -> None:
+    """
+    Give interactive input() line editing, persistent history and SQL
+    keyword completion through readline.
+    
+    Does nothing without readline, when stdin isn't a terminal, or after
+    the first call.
+    """
+    global _readline_ready
+    if readline is None or _readline_ready or not sys.stdin.isatty():
+        return
+    _readline_ready = True
+    
+    try:
+        readline.read_history_file(history_file)
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(_save_history, history_file)
+    
+    readline.set_completer(_complete_sql)
+    readline.parse_and_bind("tab: complete")
 
 
 class Shell:
@@ -30,11 +91,14 @@ class Shell:
         """Run the interactive shell."""
         self.print_welcome()
         
+        # A terminal gets input() and its readline editing; piped SQL is
+        # read straight from stdin, with no prompt to write and flush
+        read_line = self._read_terminal_line if sys.stdin.isatty() else self._read_piped_line
+        
         while self.running:
             try:
                 # Read input
-                line = input('yes_db> ')
-                line = line.strip()
+                line = read_line().strip()
                 
                 if not line:
                     continue
@@ -57,6 +121,19 @@ class Shell:
             except Exception as e:
                 print(f"Error: {e}")
     
+    @staticmethod
+    def _read_terminal_line() -> str:
+        """Prompt for and read one line on a terminal."""
+        return input('yes_db> ')
+    
+    @staticmethod
+    def _read_piped_line() -> str:
+        """Read one line of piped input, raising EOFError at the end like input()."""
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line
+    
     def print_welcome(self) -> None:
         """Print welcome message."""
         print("yes_db - Educational Relational Database")
@@ -71,21 +148,17 @@ class Shell:
             sql: The SQL statement to execute
         """
         try:
-            # Parse to get column info for SELECT
-            from chidb.sql.lexer import Lexer
-            from chidb.sql.parser import Parser, SelectStatement
-            
-            lexer = Lexer(sql)
-            tokens = lexer.tokenize()
-            parser = Parser(tokens)
-            ast = parser.parse()
-            
-            # Store column info if it's a SELECT
+            # Store column info if it's a SELECT; only a SELECT needs parsing
+            # here, the database parses every statement itself. The info is
+            # only used to project Records through table metadata, so skip
+            # the parse when the database has none.
             selected_columns = None
             table_name = None
-            if isinstance(ast, SelectStatement):
-                selected_columns = ast.columns
-                table_name = ast.table
+            if hasattr(self.db, 'table_metadata') and sql.lstrip()[:6].lower() == 'select':
+                ast = Parser(Lexer(sql).tokenize()).parse()
+                if isinstance(ast, SelectStatement):
+                    selected_columns = ast.columns
+                    table_name = ast.table
             
             # Execute the query
             results = self.db.execute(sql)
@@ -112,69 +185,77 @@ class Shell:
             print("(no rows)")
             return
         
-        from chidb.record import Record
-        
         # Get table metadata if available
         table_meta = None
         if table_name and hasattr(self.db, 'table_metadata'):
             table_meta = self.db.table_metadata.get(table_name)
         
-        # Extract all values from results
-        rows_data = []
-        for row in results:
-            row_values = []
-            for value in row:
-                # Check if value is a Record object
-                if isinstance(value, Record):
-                    all_values = value.get_values()
-                    
-                    # Filter columns if specific columns were requested
-                    if selected_columns and selected_columns != ['*'] and table_meta:
-                        # Map column names to indices
-                        filtered_values = []
-                        for col_name in selected_columns:
-                            # Find the index of this column
-                            for i, col_def in enumerate(table_meta.columns):
-                                if col_def.name == col_name:
-                                    if i < len(all_values):
-                                        filtered_values.append(all_values[i])
-                                    break
-                        row_values.extend(filtered_values)
-                    else:
-                        # Use all values
-                        row_values.extend(all_values)
-                elif value is None:
-                    row_values.append('NULL')
-                else:
-                    row_values.append(str(value))
-            rows_data.append(row_values)
+        # Map the requested column names to indices once per query
+        wanted = None
+        if selected_columns and selected_columns != ['*'] and table_meta:
+            wanted = [table_meta.column_index[name] for name in selected_columns
+                      if name in table_meta.column_index]
+        
+        # Extract all values from results, converting each to text once.
+        # Rows are uniform, so the first one decides which loop to run.
+        first = results[0]
+        if len(first) == 1 and isinstance(first[0], Record):
+            # One Record per row (table scans)
+            if wanted is not None:
+                rows_data = [[str(values[i]) for i in wanted if i < len(values)]
+                             for values in (row[0].get_values() for row in results)]
+            else:
+                rows_data = [list(map(str, row[0].get_values())) for row in results]
+        elif not any(isinstance(value, Record) for value in first):
+            # Plain values (VM result rows)
+            rows_data = [['NULL' if value is None else str(value) for value in row]
+                         for row in results]
+        else:
+            rows_data = [self._row_text(row, wanted) for row in results]
         
         if not rows_data:
             print("(no rows)")
             return
         
-        # Calculate column widths
-        num_cols = len(rows_data[0]) if rows_data else 0
-        col_widths = [0] * num_cols
-        
+        # Calculate column widths, one column at a time. Rows can differ in
+        # length (records written before an ALTER TABLE ADD COLUMN), so size
+        # the table by the longest row and pad the short ones.
+        col_widths = [max(map(len, col)) for col in zip_longest(*rows_data, fillvalue='')]
+        num_cols = len(col_widths)
         for row in rows_data:
-            for i, val in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(val)))
+            if len(row) < num_cols:
+                row.extend([''] * (num_cols - len(row)))
         
-        # Print separator line
+        # Format rows through one format string with the column widths baked in
         separator = '+' + '+'.join('-' * (w + 2) for w in col_widths) + '+'
-        print(separator)
-        
-        # Print rows
-        for row in rows_data:
-            formatted_values = []
-            for i, val in enumerate(row):
-                formatted_values.append(str(val).ljust(col_widths[i]))
-            print('| ' + ' | '.join(formatted_values) + ' |')
+        row_format = '| ' + ' | '.join('{:<%d}' % w for w in col_widths) + ' |'
         
-        # Print bottom separator
-        print(separator)
-        print(f"({len(results)} row{'s' if len(results) != 1 else ''})")
+        # Build the whole table and write it to stdout in one call
+        lines = [separator]
+        lines.extend(row_format.format(*row) for row in rows_data)
+        lines.append(separator)
+        lines.append(f"({len(results)} row{'s' if len(results) != 1 else ''})")
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+    
+    @staticmethod
+    def _row_text(row, wanted: Optional[list]) -> list:
+        """Text of each cell in a row mixing Records and plain values."""
+        row_values = []
+        for value in row:
+            if isinstance(value, Record):
+                all_values = value.get_values()
+                
+                # Filter columns if specific columns were requested
+                if wanted is not None:
+                    row_values.extend(str(all_values[i]) for i in wanted if i < len(all_values))
+                else:
+                    row_values.extend(map(str, all_values))
+            elif value is None:
+                row_values.append('NULL')
+            else:
+                row_values.append(str(value))
+        return row_values
     
     def handle_special_command(self, command: str) -> None:
         """
@@ -184,24 +265,19 @@ class Shell:
             command: The special command
         """
         command = command.lower()
+        handler = self._SPECIAL.get(command)
         
-        if command == '.exit' or command == '.quit':
-            self.running = False
-            print("Goodbye!")
-        
-        elif command == '.help':
-            self.print_help()
-        
-        elif command == '.tables':
-            self.show_tables()
-        
-        elif command == '.schema':
-            self.show_schema()
-        
+        if handler is not None:
+            handler(self)
         else:
             print(f"Unknown command: {command}")
             print("Type .help for list of commands")
     
+    def exit_shell(self) -> None:
+        """Stop the command loop."""
+        self.running = False
+        print("Goodbye!")
+    
     def print_help(self) -> None:
         """Print help message."""
         print("Special commands:")
@@ -220,8 +296,8 @@ class Shell:
         if not tables:
             print("(no tables)")
         else:
-            for table in tables:
-                print(table)
+            sys.stdout.write('\n'.join(tables) + '\n')
+            sys.stdout.flush()
     
     def show_schema(self) -> None:
         """Show table schemas."""
@@ -232,6 +308,15 @@ class Shell:
         else:
             print("Schema information not yet implemented")
             print("Tables:", ', '.join(tables))
+    
+    # Special command -> handler, built once with the class
+    _SPECIAL = {
+        '.exit': exit_shell,
+        '.quit': exit_shell,
+        '.help': print_help,
+        '.tables': show_tables,
+        '.schema': show_schema,
+    }
 
 
 def main(args: Optional[list] = None) -> int:
@@ -286,6 +371,7 @@ def main(args: Optional[list] = None) -> int:
         
         # Interactive mode
         else:
+            setup_readline()
             shell = Shell(db)
             shell.run()
             return 0
@@ -16,16 +16,33 @@ Usage:
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     requests = None
+    HTTPAdapter = object
 
 
 CREDENTIALS_PATH = os.path.expanduser("~/.yesdb/credentials.json")
 
+# (connect, read) timeout in seconds for requests that don't set their own
+DEFAULT_TIMEOUT = (5, 30)
+
+# Seconds a connection reuses its table list before asking the server again
+TABLES_CACHE_TTL = 60.0
+
+# Statements after which a cached table list is out of date
+_DDL_RE = re.compile(r"^\s*(CREATE|DROP|ALTER)\s+TABLE\b", re.IGNORECASE)
+
+# Parsed JSON files: absolute path -> ((mtime_ns, size), contents)
+_json_file_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
 
 # ── ExecuteResult ────────────────────────────────────────────────
 
@@ -73,6 +90,56 @@ class ExecuteResult:
 # ── Credential helpers ───────────────────────────────────────────
 
 
+def read_json_file(path: str) -> dict:
+    """
+    Read a small JSON config file, reusing the parsed contents while the
+    file's modification time and size are unchanged.
+
+    Returns:
+        A copy of the parsed object, so callers may modify it.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    cached = _json_file_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        with open(path, "r") as f:
+            cached = (stamp, json.load(f))
+        _json_file_cache[path] = cached
+    return dict(cached[1])
+
+
+def write_text_file(path: str, text: str) -> None:
+    """
+    Replace a file's contents atomically.
+
+    The text goes to a temporary file next to the target, which then
+    replaces it with os.replace(). A crash mid-write leaves the old file,
+    never a truncated one.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_file(path: str, data: dict) -> None:
+    """Write a JSON config file, dropping any cached copy of it."""
+    write_text_file(path, json.dumps(data, indent=2))
+    _json_file_cache.pop(os.path.abspath(path), None)
+
+
 def load_credentials(path: Optional[str] = None) -> dict:
     """
     Load saved credentials from ~/.yesdb/credentials.json.
@@ -85,12 +152,12 @@ def load_credentials(path: Optional[str] = None) -> dict:
     """
     if path is None:
         path = CREDENTIALS_PATH
-    if not os.path.exists(path):
+    try:
+        return read_json_file(path)
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"No credentials found at {path}. Run 'yesdb signup' or 'yesdb login' first."
-        )
-    with open(path, "r") as f:
-        return json.load(f)
+        ) from None
 
 
 def save_credentials(email: str, api_key: str, server_url: str, path: Optional[str] = None):
@@ -99,8 +166,45 @@ def save_credentials(email: str, api_key: str, server_url: str, path: Optional[s
         path = CREDENTIALS_PATH
     os.makedirs(os.path.dirname(path), exist_ok=True)
     data = {"email": email, "api_key": api_key, "server_url": server_url}
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    write_json_file(path, data)
+
+
+# ── HTTP session ─────────────────────────────────────────────────
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout, so a hung server can't stall the client."""
+
+    def __init__(self, *args, **kwargs):
+        self.timeout = kwargs.pop("timeout", DEFAULT_TIMEOUT)
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def configure_session(session):
+    """
+    Mount pooled, retrying adapters with a default timeout on a session.
+
+    Connections are kept alive and reused across requests, and responses
+    are requested gzip-compressed (requests' default Accept-Encoding).
+
+    Returns:
+        The same session, for chaining.
+    """
+    # Failed connections are retried for any method, but 5xx statuses only
+    # for idempotent ones: a POST may have taken effect before the error
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 # ── CloudConnection ──────────────────────────────────────────────
@@ -117,6 +221,8 @@ class CloudConnection:
         db_name: Name of the database to connect to.
         api_key: API key for authentication. If None, loaded from credentials file.
         server_url: Server URL. If None, loaded from credentials file.
+        session: requests.Session to send through, so callers can share one
+            connection pool. If None, the connection opens its own.
     """
 
     def __init__(
@@ -124,6 +230,7 @@ class CloudConnection:
         db_name: str,
         api_key: Optional[str] = None,
         server_url: Optional[str] = None,
+        session=None,
     ):
         if requests is None:
             raise ImportError(
@@ -140,13 +247,23 @@ class CloudConnection:
         self.db_name = db_name
         self.api_key = api_key
         self.server_url = server_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-        )
+        # Only a session opened here is closed with the connection
+        self._owns_session = session is None
+        self.session = configure_session(requests.Session()) if session is None else session
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        # A caller's shared session is left untouched: auth goes with each
+        # request instead, so the key never sticks to the caller's pool
+        if self._owns_session:
+            self.session.headers.update(headers)
+            self._request_kwargs: Dict[str, Any] = {}
+        else:
+            self._request_kwargs = {"headers": headers}
+        # Table list from the last /tables call and when it was fetched
+        self._tables_cache: Optional[List[str]] = None
+        self._tables_cache_ts = 0.0
 
     def _url(self, path: str) -> str:
         """Build a full URL for an API path."""
@@ -174,8 +291,10 @@ class CloudConnection:
         Returns:
             ExecuteResult with rows and engine logs.
         """
-        response = self.session.post(self._url("/execute"), json={"sql": sql})
+        response = self.session.post(self._url("/execute"), json={"sql": sql}, **self._request_kwargs)
         self._handle_response(response)
+        if _DDL_RE.match(sql):
+            self._tables_cache = None
 
         data = response.json()
         return ExecuteResult(
@@ -185,18 +304,28 @@ class CloudConnection:
         )
 
     def get_table_names(self) -> List[str]:
-        """Get list of table names from the remote database."""
-        response = self.session.get(self._url("/tables"))
-        self._handle_response(response)
-        return response.json().get("tables", [])
+        """
+        Get list of table names from the remote database.
+
+        The list is reused for TABLES_CACHE_TTL seconds, or until this
+        connection runs a CREATE/DROP/ALTER TABLE.
+        """
+        now = time.monotonic()
+        if self._tables_cache is None or now - self._tables_cache_ts >= TABLES_CACHE_TTL:
+            response = self.session.get(self._url("/tables"), **self._request_kwargs)
+            self._handle_response(response)
+            self._tables_cache = response.json().get("tables", [])
+            self._tables_cache_ts = now
+        return list(self._tables_cache)
 
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists on the remote database."""
         return table_name in self.get_table_names()
 
     def close(self) -> None:
-        """Close the HTTP session."""
-        self.session.close()
+        """Close the HTTP session, unless it was passed in by the caller."""
+        if self._owns_session:
+            self.session.close()
 
     def __enter__(self):
         return self
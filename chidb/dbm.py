@@ -3,7 +3,9 @@ Database Machine (DBM) - Virtual machine for executing database operations.
 The DBM executes a sequence of low-level instructions to perform database tasks.
 """
 
-from typing import List, Any, Optional, Dict
+import operator
+from itertools import dropwhile
+from typing import List, Any, Optional, Dict, Callable, Iterator, Tuple
 from dataclasses import dataclass
 from enum import IntEnum
 from chidb.pager import Pager
@@ -39,11 +41,17 @@ class Opcode(IntEnum):
     SEEK = 23          # Seek to specific key
     DELETE = 24        # Delete current record
     COLUMN = 25        # Extract column from record
+    VARIABLE = 26      # Push bound parameter onto stack
 
 
-@dataclass
+@dataclass(frozen=True)
 class Instruction:
-    """Represents a single DBM instruction."""
+    """
+    Represents a single DBM instruction.
+    
+    Instructions are immutable, so compiled programs can be cached and
+    rerun, and each one formats its repr only once.
+    """
     opcode: Opcode
     p1: int = 0        # First parameter
     p2: int = 0        # Second parameter
@@ -51,6 +59,14 @@ class Instruction:
     p4: Any = None     # Fourth parameter (usually string/data)
     
     def __repr__(self) -> str:
+        text = self.__dict__.get('_repr')
+        if text is None:
+            text = self._format()
+            object.__setattr__(self, '_repr', text)
+        return text
+    
+    def _format(self) -> str:
+        """Build the repr text."""
         if self.p4 is not None:
             return f"{Opcode(self.opcode).name}({self.p1}, {self.p2}, {self.p3}, {self.p4!r})"
         elif self.p3 != 0:
@@ -71,18 +87,22 @@ class Cursor:
     def __init__(self, btree: BTree, writable: bool = False):
         self.btree = btree
         self.writable = writable
-        self.data: List[tuple] = []  # (key, record) pairs
-        self.position = -1
+        # Rows are streamed from the tree: only the current (key, record)
+        # pair is held, and the iterator yields the ones after it
+        self._iter: Iterator[Tuple[int, Record]] = iter(())
+        self._current: Optional[Tuple[int, Record]] = None
         self.valid = False
     
     def rewind(self) -> None:
         """Move cursor to the beginning."""
-        self.data = self.btree.scan()
-        self.position = -1
-        self.valid = False
-        if self.data:
-            self.position = 0
-            self.valid = True
+        self._iter = self.btree.iter_scan()
+        self._advance()
+    
+    def _advance(self) -> bool:
+        """Step to the iterator's next row, if any."""
+        self._current = next(self._iter, None)
+        self.valid = self._current is not None
+        return self.valid
     
     def next(self) -> bool:
         """
@@ -93,25 +113,19 @@ class Cursor:
         """
         if not self.valid:
             return False
-        
-        self.position += 1
-        if self.position >= len(self.data):
-            self.valid = False
-            return False
-        
-        return True
+        return self._advance()
     
     def get_key(self) -> Optional[int]:
         """Get the current key."""
-        if not self.valid or self.position < 0 or self.position >= len(self.data):
+        if not self.valid:
             return None
-        return self.data[self.position][0]
+        return self._current[0]
     
     def get_data(self) -> Optional[Record]:
         """Get the current record."""
-        if not self.valid or self.position < 0 or self.position >= len(self.data):
+        if not self.valid:
             return None
-        return self.data[self.position][1]
+        return self._current[1]
     
     def seek(self, key: int) -> bool:
         """
@@ -120,17 +134,17 @@ class Cursor:
         Returns:
             True if key found, False otherwise
         """
-        if not self.data:
-            self.data = self.btree.scan()
-        
-        for i, (k, record) in enumerate(self.data):
-            if k == key:
-                self.position = i
-                self.valid = True
-                return True
+        record = self.btree.search(key)
+        if record is None:
+            self._current = None
+            self.valid = False
+            return False
         
-        self.valid = False
-        return False
+        self._current = (key, record)
+        self.valid = True
+        # Rows after the key are only scanned for if next() is called
+        self._iter = dropwhile(lambda row: row[0] <= key, self.btree.iter_scan())
+        return True
     
     def is_valid(self) -> bool:
         """Check if cursor is pointing to a valid record."""
@@ -159,29 +173,82 @@ class DatabaseMachine:
         self.btrees: Dict[int, BTree] = {}
         self.stack: List[Any] = []
         self.result_rows: List[List[Any]] = []
+        self.params: List[Any] = []  # Bound parameters for VARIABLE
         self.pc = 0  # Program counter
+        self._jump: Optional[int] = None  # Target set by a taken jump
         self.halted = False
-    
-    def execute(self, program: List[Instruction]) -> List[List[Any]]:
+        
+        # Opcode -> handler taking the instruction, built once per machine
+        self._dispatch: Dict[int, Callable[[Instruction], None]] = {
+            Opcode.OPEN_READ: lambda i: self._op_open_read(i.p1, i.p2),
+            Opcode.OPEN_WRITE: lambda i: self._op_open_write(i.p1, i.p2),
+            Opcode.CLOSE: lambda i: self._op_close(i.p1),
+            Opcode.REWIND: lambda i: self._op_rewind(i.p1, i.p2),
+            Opcode.NEXT: lambda i: self._op_next(i.p1, i.p2),
+            Opcode.KEY: lambda i: self._op_key(i.p1),
+            Opcode.DATA: lambda i: self._op_data(i.p1),
+            Opcode.INSERT: lambda i: self._op_insert(i.p1),
+            Opcode.HALT: lambda i: self._op_halt(),
+            Opcode.RESULT_ROW: lambda i: self._op_result_row(i.p1),
+            Opcode.INTEGER: lambda i: self._op_integer(i.p1),
+            Opcode.STRING: lambda i: self._op_string(i.p4),
+            Opcode.NULL: lambda i: self._op_null(),
+            Opcode.MAKE_RECORD: lambda i: self._op_make_record(i.p1),
+            Opcode.SEEK: lambda i: self._op_seek(i.p1, i.p2),
+            Opcode.JUMP: lambda i: self._op_jump(i.p1),
+            Opcode.JUMP_IF_FALSE: lambda i: self._op_jump_if_false(i.p1),
+            Opcode.DELETE: lambda i: self._op_delete(i.p1),
+            Opcode.COLUMN: lambda i: self._op_column(i.p1, i.p2),
+            Opcode.VARIABLE: lambda i: self._op_variable(i.p1),
+            Opcode.EQ: self._make_compare(operator.eq),
+            Opcode.NE: self._make_compare(operator.ne),
+            Opcode.LT: self._make_compare(operator.lt),
+            Opcode.LE: self._make_compare(operator.le),
+            Opcode.GT: self._make_compare(operator.gt),
+            Opcode.GE: self._make_compare(operator.ge),
+        }
+    
+    def execute(self, program: List[Instruction], params: Optional[List[Any]] = None) -> List[List[Any]]:
         """
         Execute a database program.
         
         Args:
             program: List of instructions to execute
+            params: Values bound to VARIABLE instructions (by index)
             
         Returns:
             List of result rows
         """
         self.reset()
-        
-        while self.pc < len(program) and not self.halted:
-            instruction = program[self.pc]
-            log_dbm_instruction(str(instruction))
-            
-            self._execute_instruction(instruction)
-            
-            if not self.halted:
-                self.pc += 1
+        self.params = params if params is not None else []
+        
+        # Keep the loop state in locals; pc is written back once at the end
+        dispatch = self._dispatch
+        program_len = len(program)
+        trace = self.logger.is_trace_enabled()
+        pc = 0
+        
+        try:
+            while pc < program_len:
+                instruction = program[pc]
+                if trace:
+                    log_dbm_instruction(repr(instruction))
+                
+                try:
+                    handler = dispatch[instruction.opcode]
+                except KeyError:
+                    raise ValueError(f"Unknown opcode: {instruction.opcode}") from None
+                handler(instruction)
+                
+                if self.halted:
+                    break
+                if self._jump is not None:
+                    pc = self._jump
+                    self._jump = None
+                else:
+                    pc += 1
+        finally:
+            self.pc = pc
         
         return self.result_rows
     
@@ -194,90 +261,39 @@ class DatabaseMachine:
         self.stack.clear()
         self.result_rows.clear()
         self.pc = 0
+        self._jump = None
         self.halted = False
     
     def _execute_instruction(self, instr: Instruction) -> None:
         """Execute a single instruction."""
-        opcode = instr.opcode
-        
-        if opcode == Opcode.OPEN_READ:
-            self._op_open_read(instr.p1, instr.p2)
-        
-        elif opcode == Opcode.OPEN_WRITE:
-            self._op_open_write(instr.p1, instr.p2)
-        
-        elif opcode == Opcode.CLOSE:
-            self._op_close(instr.p1)
-        
-        elif opcode == Opcode.REWIND:
-            self._op_rewind(instr.p1, instr.p2)
-        
-        elif opcode == Opcode.NEXT:
-            self._op_next(instr.p1, instr.p2)
-        
-        elif opcode == Opcode.KEY:
-            self._op_key(instr.p1)
-        
-        elif opcode == Opcode.DATA:
-            self._op_data(instr.p1)
-        
-        elif opcode == Opcode.INSERT:
-            self._op_insert(instr.p1)
-        
-        elif opcode == Opcode.HALT:
-            self._op_halt()
-        
-        elif opcode == Opcode.RESULT_ROW:
-            self._op_result_row(instr.p1)
-        
-        elif opcode == Opcode.INTEGER:
-            self._op_integer(instr.p1)
-        
-        elif opcode == Opcode.STRING:
-            self._op_string(instr.p4)
-        
-        elif opcode == Opcode.NULL:
-            self._op_null()
-        
-        elif opcode == Opcode.MAKE_RECORD:
-            self._op_make_record(instr.p1)
-        
-        elif opcode == Opcode.SEEK:
-            self._op_seek(instr.p1, instr.p2)
-        
-        elif opcode == Opcode.JUMP:
-            self._op_jump(instr.p1)
-        
-        elif opcode == Opcode.JUMP_IF_FALSE:
-            self._op_jump_if_false(instr.p1)
-        
-        elif opcode == Opcode.DELETE:
-            self._op_delete(instr.p1)
-        
-        elif opcode == Opcode.COLUMN:
-            self._op_column(instr.p1, instr.p2)
-        
-        elif opcode in (Opcode.EQ, Opcode.NE, Opcode.LT, Opcode.LE, Opcode.GT, Opcode.GE):
-            self._op_compare(opcode)
+        handler = self._dispatch.get(instr.opcode)
+        if handler is None:
+            raise ValueError(f"Unknown opcode: {instr.opcode}")
+        handler(instr)
+    
+    def get_btree(self, root_page: int) -> BTree:
+        """
+        Return the B-tree rooted at root_page, opening it on first use.
         
-        else:
-            raise ValueError(f"Unknown opcode: {opcode}")
+        One instance per tree is kept for the life of the machine and shared
+        by every cursor and execution.
+        """
+        btree = self.btrees.get(root_page)
+        if btree is None:
+            btree = self.btrees[root_page] = BTree(self.pager, root_page)
+        return btree
+    
+    def invalidate_btree(self, root_page: int) -> None:
+        """Forget the B-tree opened at root_page (its table was dropped or moved)."""
+        self.btrees.pop(root_page, None)
     
     def _op_open_read(self, cursor_id: int, root_page: int) -> None:
         """Open a table for reading."""
-        if root_page not in self.btrees:
-            self.btrees[root_page] = BTree(self.pager, root_page)
-        
-        btree = self.btrees[root_page]
-        self.cursors[cursor_id] = Cursor(btree, writable=False)
+        self.cursors[cursor_id] = Cursor(self.get_btree(root_page), writable=False)
     
     def _op_open_write(self, cursor_id: int, root_page: int) -> None:
         """Open a table for writing."""
-        if root_page not in self.btrees:
-            self.btrees[root_page] = BTree(self.pager, root_page)
-
-        btree = self.btrees[root_page]
-        self.cursors[cursor_id] = Cursor(btree, writable=True)
+        self.cursors[cursor_id] = Cursor(self.get_btree(root_page), writable=True)
     
     def _op_close(self, cursor_id: int) -> None:
         """Close a cursor."""
@@ -290,13 +306,13 @@ class DatabaseMachine:
         cursor.rewind()
         
         if not cursor.is_valid():
-            self.pc = jump_addr - 1  # -1 because pc will be incremented
+            self._jump = jump_addr
     
     def _op_next(self, cursor_id: int, jump_addr: int) -> None:
         """Move to next record, jump to addr if moved successfully."""
         cursor = self.cursors[cursor_id]
         if cursor.next():
-            self.pc = jump_addr - 1  # -1 because pc will be incremented
+            self._jump = jump_addr
     
     def _op_key(self, cursor_id: int) -> None:
         """Push current key onto stack."""
@@ -330,14 +346,14 @@ class DatabaseMachine:
     
     def _op_result_row(self, num_columns: int) -> None:
         """Output a result row. Pops num_columns values from stack."""
-        if len(self.stack) < num_columns:
+        stack = self.stack
+        start = len(stack) - num_columns
+        if start < 0:
             raise RuntimeError(f"RESULT_ROW requires {num_columns} values on stack")
         
-        row = []
-        for _ in range(num_columns):
-            row.append(self.stack.pop())
-        
-        row.reverse()  # We popped in reverse order
+        # Take the top values in one slice, already in column order
+        row = stack[start:]
+        del stack[start:]
         self.result_rows.append(row)
     
     def _op_integer(self, value: int) -> None:
@@ -348,22 +364,26 @@ class DatabaseMachine:
         """Push string constant onto stack."""
         self.stack.append(value)
     
+    def _op_variable(self, index: int) -> None:
+        """Push bound parameter onto stack."""
+        if index >= len(self.params):
+            raise RuntimeError(f"VARIABLE {index} has no bound parameter")
+        self.stack.append(self.params[index])
+    
     def _op_null(self) -> None:
         """Push null onto stack."""
         self.stack.append(None)
     
     def _op_make_record(self, num_fields: int) -> None:
         """Create a record from top num_fields stack values."""
-        if len(self.stack) < num_fields:
+        stack = self.stack
+        start = len(stack) - num_fields
+        if start < 0:
             raise RuntimeError(f"MAKE_RECORD requires {num_fields} values on stack")
         
-        values = []
-        for _ in range(num_fields):
-            values.append(self.stack.pop())
-        
-        values.reverse()
-        record = Record(values)
-        self.stack.append(record)
+        values = stack[start:]
+        del stack[start:]
+        stack.append(Record(values))
     
     def _op_seek(self, cursor_id: int, key: int) -> None:
         """Seek cursor to specific key."""
@@ -372,7 +392,7 @@ class DatabaseMachine:
     
     def _op_jump(self, addr: int) -> None:
         """Unconditional jump."""
-        self.pc = addr - 1  # -1 because pc will be incremented
+        self._jump = addr
     
     def _op_jump_if_false(self, addr: int) -> None:
         """Jump if top of stack is false."""
@@ -381,32 +401,25 @@ class DatabaseMachine:
         
         value = self.stack.pop()
         if not value:
-            self.pc = addr - 1
+            self._jump = addr
     
-    def _op_compare(self, opcode: Opcode) -> None:
-        """Compare two values on stack and push result."""
-        if len(self.stack) < 2:
-            raise RuntimeError("Comparison requires 2 values on stack")
+    def _make_compare(self, compare: Callable[[Any, Any], bool]) -> Callable[[Instruction], None]:
+        """
+        Build the handler for one comparison opcode.
         
-        right = self.stack.pop()
-        left = self.stack.pop()
+        The handler pops two values and pushes compare(left, right), so each
+        comparison opcode is resolved at dispatch time rather than per call.
+        """
+        stack = self.stack
         
-        if opcode == Opcode.EQ:
-            result = left == right
-        elif opcode == Opcode.NE:
-            result = left != right
-        elif opcode == Opcode.LT:
-            result = left < right
-        elif opcode == Opcode.LE:
-            result = left <= right
-        elif opcode == Opcode.GT:
-            result = left > right
-        elif opcode == Opcode.GE:
-            result = left >= right
-        else:
-            raise ValueError(f"Invalid comparison opcode: {opcode}")
+        def handler(instr: Instruction) -> None:
+            if len(stack) < 2:
+                raise RuntimeError("Comparison requires 2 values on stack")
+            left, right = stack[-2:]
+            del stack[-2:]
+            stack.append(compare(left, right))
         
-        self.stack.append(result)
+        return handler
     
     def _op_delete(self, cursor_id: int) -> None:
         """
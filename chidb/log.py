@@ -42,30 +42,34 @@ class DatabaseLogger:
         """Set the logging level."""
         self.logger.setLevel(level)
     
-    def critical(self, msg: str, **kwargs) -> None:
+    def critical(self, msg: str, *args, **kwargs) -> None:
         """Log critical error message."""
-        self.logger.critical(msg, **kwargs)
+        self.logger.critical(msg, *args, **kwargs)
     
-    def error(self, msg: str, **kwargs) -> None:
+    def error(self, msg: str, *args, **kwargs) -> None:
         """Log error message."""
-        self.logger.error(msg, **kwargs)
+        self.logger.error(msg, *args, **kwargs)
     
-    def warning(self, msg: str, **kwargs) -> None:
+    def warning(self, msg: str, *args, **kwargs) -> None:
         """Log warning message."""
-        self.logger.warning(msg, **kwargs)
+        self.logger.warning(msg, *args, **kwargs)
     
-    def info(self, msg: str, **kwargs) -> None:
+    def info(self, msg: str, *args, **kwargs) -> None:
         """Log info message."""
-        self.logger.info(msg, **kwargs)
+        self.logger.info(msg, *args, **kwargs)
     
-    def debug(self, msg: str, **kwargs) -> None:
+    def debug(self, msg: str, *args, **kwargs) -> None:
         """Log debug message."""
-        self.logger.debug(msg, **kwargs)
+        self.logger.debug(msg, *args, **kwargs)
     
-    def trace(self, msg: str, **kwargs) -> None:
+    def is_trace_enabled(self) -> bool:
+        """Whether trace messages are logged; lets hot paths skip formatting."""
+        return self.logger.level <= LogLevel.TRACE
+    
+    def trace(self, msg: str, *args, **kwargs) -> None:
         """Log trace message (very verbose)."""
-        if self.logger.level <= LogLevel.TRACE:
-            self.logger.log(LogLevel.TRACE, msg, **kwargs)
+        if self.is_trace_enabled():
+            self.logger.log(LogLevel.TRACE, msg, *args, **kwargs)
 
 
 # Global logger instances for different components
@@ -96,52 +100,52 @@ def set_global_level(level: int) -> None:
 def log_page_read(page_id: int, component: str = "pager") -> None:
     """Log a page read operation."""
     logger = get_logger(component)
-    logger.trace(f"Reading page {page_id}")
+    logger.trace("Reading page %s", page_id)
 
 
 def log_page_write(page_id: int, component: str = "pager") -> None:
     """Log a page write operation."""
     logger = get_logger(component)
-    logger.trace(f"Writing page {page_id}")
+    logger.trace("Writing page %s", page_id)
 
 
 def log_page_allocate(page_id: int, component: str = "pager") -> None:
     """Log a page allocation."""
     logger = get_logger(component)
-    logger.debug(f"Allocated new page {page_id}")
+    logger.debug("Allocated new page %s", page_id)
 
 
 def log_btree_insert(key: Any, component: str = "btree") -> None:
     """Log a B-tree insertion."""
     logger = get_logger(component)
-    logger.debug(f"Inserting key {key} into B-tree")
+    logger.debug("Inserting key %s into B-tree", key)
 
 
 def log_btree_split(page_id: int, component: str = "btree") -> None:
     """Log a B-tree node split."""
     logger = get_logger(component)
-    logger.info(f"Splitting B-tree node at page {page_id}")
+    logger.info("Splitting B-tree node at page %s", page_id)
 
 
 def log_btree_search(key: Any, component: str = "btree") -> None:
     """Log a B-tree search."""
     logger = get_logger(component)
-    logger.trace(f"Searching for key {key} in B-tree")
+    logger.trace("Searching for key %s in B-tree", key)
 
 
 def log_dbm_instruction(instruction: str, component: str = "dbm") -> None:
     """Log a DBM instruction execution."""
     logger = get_logger(component)
-    logger.trace(f"Executing instruction: {instruction}")
+    logger.trace("Executing instruction: %s", instruction)
 
 
 def log_sql_parse(sql: str, component: str = "sql") -> None:
     """Log SQL parsing."""
     logger = get_logger(component)
-    logger.debug(f"Parsing SQL: {sql}")
+    logger.debug("Parsing SQL: %s", sql)
 
 
 def log_sql_codegen(statement_type: str, component: str = "sql") -> None:
     """Log SQL code generation."""
     logger = get_logger(component)
-    logger.debug(f"Generating code for {statement_type} statement")
\ No newline at end of file
+    logger.debug("Generating code for %s statement", statement_type)
\ No newline at end of file
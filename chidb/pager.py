@@ -4,7 +4,7 @@ Manages reading, writing, and caching of fixed-size pages.
 """
 
 import os
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Union
 from chidb.util import pack_uint32, unpack_uint32, assert_valid_page_id
 from chidb.log import get_logger, log_page_read, log_page_write, log_page_allocate
 
@@ -88,7 +88,7 @@ class Pager:
         file_size = self.file_handle.tell()
         self.num_pages = file_size // self.page_size
         
-        self.logger.info(f"Opened database '{self.filename}' with {self.num_pages} pages")
+        self.logger.info("Opened database '%s' with %s pages", self.filename, self.num_pages)
     
     def _create_new(self) -> None:
         """Create a new database file."""
@@ -100,7 +100,7 @@ class Pager:
         self.file_handle.flush()
         
         self.num_pages = 1
-        self.logger.info(f"Created new database '{self.filename}'")
+        self.logger.info("Created new database '%s'", self.filename)
     
     def _create_header(self) -> bytes:
         """Create the database file header."""
@@ -157,10 +157,46 @@ class Pager:
         log_page_read(page_id)
         return page_buffer
     
-    def write_page(self, page_id: int, data: bytes) -> None:
+    def prefetch(self, page_ids: Iterable[int]) -> None:
+        """
+        Load pages into the cache ahead of use.
+        
+        Runs of consecutive uncached pages are read with a single read call,
+        so a scan about to visit a node's children pays one seek per run
+        instead of one per page.
+        
+        Args:
+            page_ids: The page numbers that will be read soon
+        """
+        missing = sorted(
+            page_id for page_id in set(page_ids)
+            if 0 <= page_id < self.num_pages and page_id not in self.page_cache
+        )
+        
+        i = 0
+        while i < len(missing):
+            # Extend the run while the page numbers are consecutive
+            start = missing[i]
+            count = 1
+            while i + count < len(missing) and missing[i + count] == start + count:
+                count += 1
+            i += count
+            
+            self.file_handle.seek(start * self.page_size)
+            data = self.file_handle.read(count * self.page_size)
+            
+            # Cache the complete pages (read_page reports any short read)
+            for n in range(len(data) // self.page_size):
+                offset = n * self.page_size
+                self.page_cache[start + n] = bytearray(data[offset:offset + self.page_size])
+    
+    def write_page(self, page_id: int, data: Union[bytes, bytearray]) -> None:
         """
         Write a page to disk.
         
+        Passing back the buffer returned by read_page() marks it dirty
+        without copying it; any other buffer is copied into the cache.
+        
         Args:
             page_id: The page number to write
             data: The page data (must be exactly page_size bytes)
@@ -171,15 +207,23 @@ class Pager:
             raise ValueError(f"Page data must be exactly {self.page_size} bytes")
         
         # Update cache
-        self.page_cache[page_id] = bytearray(data)
+        if data is not self.page_cache.get(page_id):
+            self.page_cache[page_id] = bytearray(data)
         self.dirty_pages.add(page_id)
         
         log_page_write(page_id)
     
-    def allocate_page(self) -> int:
+    def allocate_page(self, initial_data: bytes = b'') -> int:
         """
         Allocate a new page.
         
+        The page exists only in the cache until the next flush, so it is
+        never read back from disk.
+        
+        Args:
+            initial_data: Bytes to place at the start of the otherwise zeroed
+                page, such as a node header
+        
         Returns:
             The page ID of the newly allocated page
         """
@@ -187,8 +231,9 @@ class Pager:
         self.num_pages += 1
         
         # Create empty page
-        empty_page = bytearray(self.page_size)
-        self.page_cache[new_page_id] = empty_page
+        new_page = bytearray(self.page_size)
+        new_page[:len(initial_data)] = initial_data
+        self.page_cache[new_page_id] = new_page
         self.dirty_pages.add(new_page_id)
         
         # Update header with new page count
@@ -204,10 +249,19 @@ class Pager:
         if not self.dirty_pages:
             return
         
-        for page_id in self.dirty_pages:
-            if page_id in self.page_cache:
-                self.file_handle.seek(page_id * self.page_size)
-                self.file_handle.write(self.page_cache[page_id])
+        # Write in page order, one write call per run of consecutive pages
+        dirty = sorted(page_id for page_id in self.dirty_pages if page_id in self.page_cache)
+        
+        i = 0
+        while i < len(dirty):
+            start = dirty[i]
+            count = 1
+            while i + count < len(dirty) and dirty[i + count] == start + count:
+                count += 1
+            i += count
+            
+            self.file_handle.seek(start * self.page_size)
+            self.file_handle.write(b''.join(self.page_cache[start + n] for n in range(count)))
         
         self.file_handle.flush()
         self.dirty_pages.clear()
@@ -223,7 +277,7 @@ class Pager:
             self.file_handle = None
         
         self.page_cache.clear()
-        self.logger.info(f"Closed database '{self.filename}'")
+        self.logger.info("Closed database '%s'", self.filename)
     
     def get_page_size(self) -> int:
         """Get the page size."""
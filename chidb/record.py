@@ -3,6 +3,7 @@ Record encoding and decoding.
 Handles serialization of database rows to binary format.
 """
 
+import struct
 from typing import Any, List, Tuple, Optional
 from enum import IntEnum
 from chidb.util import (
@@ -34,6 +35,9 @@ class Record:
     [header_size: varint][num_columns: varint][type1: varint][type2: varint]...[data1][data2]...
     """
     
+    # One Record is built per row read, so skip the per-instance __dict__
+    __slots__ = ('values',)
+    
     def __init__(self, values: List[Any]):
         """
         Create a record from a list of values.
@@ -120,7 +124,6 @@ class Record:
             return pack_varint(value)
         elif isinstance(value, float):
             # Encode float as 8 bytes (double precision)
-            import struct
             return struct.pack('>d', value)
         elif isinstance(value, str):
             # Encode text as UTF-8 with length prefix
@@ -133,18 +136,19 @@ class Record:
             raise TypeError(f"Cannot encode type: {type(value)}")
     
     @staticmethod
-    def decode(data: bytes) -> 'Record':
+    def decode(data: bytes, offset: int = 0, end: Optional[int] = None) -> 'Record':
         """
         Decode a record from binary format.
         
         Args:
             data: Binary data to decode
+            offset: Where the record starts in data, so a record can be
+                decoded straight out of a page without slicing it first
+            end: Where the record ends in data (defaults to the end of data)
             
         Returns:
             Decoded Record object
         """
-        offset = 0
-        
         # Read header size
         header_size, consumed = unpack_varint(data, offset)
         offset += consumed
@@ -163,18 +167,21 @@ class Record:
         # Now we're at the data section
         # offset should be at header_size + size_of_header_size_varint
         
+        if end is None:
+            end = len(data)
+        
         values = []
         for type_code in type_codes:
-            value, consumed = Record._decode_value(data, offset, type_code)
+            value, consumed = Record._decode_value(data, offset, type_code, end)
             values.append(value)
             offset += consumed
         
         return Record(values)
     
     @staticmethod
-    def _decode_value(data: bytes, offset: int, type_code: int) -> Tuple[Any, int]:
+    def _decode_value(data: bytes, offset: int, type_code: int, end: int) -> Tuple[Any, int]:
         """
-        Decode a single value from bytes.
+        Decode a single value from bytes, reading no further than end.
         
         Returns:
             Tuple of (value, bytes_consumed)
@@ -186,17 +193,19 @@ class Record:
             # Try varint first for positive numbers
             try:
                 value, consumed = unpack_varint(data, offset)
-                return value, consumed
-            except:
-                # If varint fails, try 4-byte encoding
-                value = unpack_uint32(data, offset)
-                # Convert back from unsigned to signed if needed
-                if value > 0x7FFFFFFF:
-                    value = value - 0x100000000
-                return value, 4
+                if offset + consumed <= end:
+                    return value, consumed
+            except ValueError:
+                pass
+            
+            # If the varint runs past the record, it is the 4-byte encoding
+            value = unpack_uint32(data, offset)
+            # Convert back from unsigned to signed if needed
+            if value > 0x7FFFFFFF:
+                value = value - 0x100000000
+            return value, 4
         
         elif type_code == DataType.FLOAT:
-            import struct
             value = struct.unpack_from('>d', data, offset)[0]
             return value, 8
         
@@ -226,6 +235,12 @@ class Record:
             raise IndexError(f"Column index {index} out of range")
         return self.values[index]
     
+    def set_value(self, index: int, value: Any) -> None:
+        """Set a specific value by column index."""
+        if index < 0 or index >= len(self.values):
+            raise IndexError(f"Column index {index} out of range")
+        self.values[index] = value
+    
     def __len__(self) -> int:
         """Get the number of columns."""
         return len(self.values)
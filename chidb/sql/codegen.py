@@ -165,22 +165,90 @@ class CodeGenerator:
         # Open cursor for writing
         instructions.append(Instruction(Opcode.OPEN_WRITE, p1=cursor_id, p2=root_page))
         
+        # Resolve the key and the final column values
+        key, *values = self.bind_insert(stmt)
+        
+        # Push key
+        instructions.append(Instruction(Opcode.INTEGER, p1=key))
+        
+        # Push values onto stack
+        for value in values:
+            if value is None:
+                instructions.append(Instruction(Opcode.NULL))
+            elif isinstance(value, int):
+                instructions.append(Instruction(Opcode.INTEGER, p1=value))
+            else:
+                instructions.append(Instruction(Opcode.STRING, p4=value))
+        
+        # Make record from values
+        instructions.append(Instruction(Opcode.MAKE_RECORD, p1=len(values)))
+        
+        # Insert the record
+        instructions.append(Instruction(Opcode.INSERT, p1=cursor_id))
+        
+        # Close cursor
+        instructions.append(Instruction(Opcode.CLOSE, p1=cursor_id))
+        
+        # Halt
+        instructions.append(Instruction(Opcode.HALT))
+        
+        return instructions
+    
+    def generate_insert_template(self, stmt: InsertStatement) -> List[Instruction]:
+        """
+        Generate a parameterized program for an INSERT statement.
+        
+        The program only depends on the table and the number of values, so it
+        can be reused for every INSERT of the same shape. The key and column
+        values are supplied at run time from bind_insert() via VARIABLE.
+        
+        Generated code pattern:
+        1. OPEN_WRITE cursor, root_page
+        2. VARIABLE 0 (key)
+        3. VARIABLE 1..n (column values)
+        4. MAKE_RECORD n
+        5. INSERT cursor
+        6. CLOSE cursor
+        7. HALT
+        """
+        log_sql_codegen("INSERT")
+        cursor_id = 0
+        num_values = len(stmt.values)
+        
+        instructions = [Instruction(Opcode.OPEN_WRITE, p1=cursor_id, p2=self.get_table_root(stmt.table))]
+        for i in range(num_values + 1):
+            instructions.append(Instruction(Opcode.VARIABLE, p1=i))
+        instructions.append(Instruction(Opcode.MAKE_RECORD, p1=num_values))
+        instructions.append(Instruction(Opcode.INSERT, p1=cursor_id))
+        instructions.append(Instruction(Opcode.CLOSE, p1=cursor_id))
+        instructions.append(Instruction(Opcode.HALT))
+        
+        return instructions
+    
+    def bind_insert(self, stmt: InsertStatement) -> List[Any]:
+        """
+        Resolve the parameters for an INSERT statement.
+        
+        Assigns an auto-increment key when needed (PRIMARY KEY omitted or NULL).
+        The statement itself is not modified, so a cached AST can be re-bound.
+        
+        Returns:
+            [key, value1, value2, ...]
+        """
+        values = list(stmt.values)
+        
         # Check if table has metadata and a primary key
         table_meta = self.table_metadata.get(stmt.table) if self.table_metadata else None
         
         # Determine the key to use
         if table_meta and table_meta.primary_key_column:
             # Find the primary key column index
-            pk_index = None
-            for i, col in enumerate(table_meta.columns):
-                if col.name == table_meta.primary_key_column:
-                    pk_index = i
-                    break
+            pk_index = table_meta.column_index.get(table_meta.primary_key_column)
             
             # Check if user provided value for PK
-            if pk_index is not None and pk_index < len(stmt.values) and stmt.values[pk_index] is not None:
+            if pk_index is not None and pk_index < len(values) and values[pk_index] is not None:
                 # User provided PK value
-                key = stmt.values[pk_index]
+                key = values[pk_index]
             else:
                 # Auto-generate PK value
                 key = table_meta.next_auto_increment
@@ -189,45 +257,23 @@ class CodeGenerator:
                 # Insert the auto-generated value into the correct position
                 # For now, assume PK is first column if not specified
                 if pk_index == 0:
-                    stmt.values = [key] + stmt.values[1:] if len(stmt.values) > 1 else [key]
-                elif pk_index is not None and pk_index < len(stmt.values):
-                    stmt.values[pk_index] = key
+                    values = [key] + values[1:] if len(values) > 1 else [key]
+                elif pk_index is not None and pk_index < len(values):
+                    values[pk_index] = key
         else:
             # No primary key, use auto-increment key
             key = self.next_auto_key
             self.next_auto_key += 1
         
-        # Push key
-        instructions.append(Instruction(Opcode.INTEGER, p1=key))
-        
-        # Push values onto stack
-        for value in stmt.values:
-            if value is None:
-                instructions.append(Instruction(Opcode.NULL))
-            elif isinstance(value, int):
-                instructions.append(Instruction(Opcode.INTEGER, p1=value))
-            elif isinstance(value, str):
-                instructions.append(Instruction(Opcode.STRING, p4=value))
-            elif isinstance(value, float):
-                # For floats, we'll push as integer (simplified)
+        for i, value in enumerate(values):
+            if isinstance(value, float):
+                # For floats, we'll store as integer (simplified)
                 # In full implementation, add FLOAT opcode
-                instructions.append(Instruction(Opcode.INTEGER, p1=int(value)))
-            else:
+                values[i] = int(value)
+            elif value is not None and not isinstance(value, (int, str)):
                 raise ValueError(f"Unsupported value type: {type(value)}")
         
-        # Make record from values
-        instructions.append(Instruction(Opcode.MAKE_RECORD, p1=len(stmt.values)))
-        
-        # Insert the record
-        instructions.append(Instruction(Opcode.INSERT, p1=cursor_id))
-        
-        # Close cursor
-        instructions.append(Instruction(Opcode.CLOSE, p1=cursor_id))
-        
-        # Halt
-        instructions.append(Instruction(Opcode.HALT))
-        
-        return instructions
+        return [key] + values
     
     def generate_create_table(self, stmt: CreateTableStatement) -> List[Instruction]:
         """
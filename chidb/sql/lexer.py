@@ -138,10 +138,19 @@ class Lexer:
     SQL Lexer for tokenizing SQL statements.
     """
     
-    def __init__(self, source: str):
+    def __init__(self, source: str = ''):
         """
         Initialize the lexer.
         
+        Args:
+            source: SQL source code to tokenize
+        """
+        self.reset(source)
+    
+    def reset(self, source: str) -> None:
+        """
+        Rebind the lexer to new source code so one instance can be reused.
+        
         Args:
             source: SQL source code to tokenize
         """
@@ -349,13 +358,19 @@ class Lexer:
         # End of file
         return Token(TokenType.EOF, None, self.line, self.column)
     
-    def tokenize(self) -> List[Token]:
+    def tokenize(self, source: Optional[str] = None) -> List[Token]:
         """
         Tokenize the entire source code.
         
+        Args:
+            source: New source to tokenize (default: the current source)
+        
         Returns:
             List of all tokens
         """
+        if source is not None:
+            self.reset(source)
+        
         tokens = []
         
         while True:
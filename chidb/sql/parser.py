@@ -148,10 +148,19 @@ class Parser:
     SQL Parser for converting tokens into AST.
     """
     
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: Optional[List[Token]] = None):
         """
         Initialize the parser.
         
+        Args:
+            tokens: List of tokens from the lexer
+        """
+        self.reset(tokens or [])
+    
+    def reset(self, tokens: List[Token]) -> None:
+        """
+        Rebind the parser to a new token stream so one instance can be reused.
+        
         Args:
             tokens: List of tokens from the lexer
         """
@@ -194,13 +203,19 @@ class Parser:
             return False
         return self.current_token.type in token_types
     
-    def parse(self) -> ASTNode:
+    def parse(self, tokens: Optional[List[Token]] = None) -> ASTNode:
         """
         Parse the token stream into an AST.
         
+        Args:
+            tokens: New token stream to parse (default: the current tokens)
+        
         Returns:
             Root AST node
         """
+        if tokens is not None:
+            self.reset(tokens)
+        
         if self.match(TokenType.SELECT):
             return self.parse_select()
         elif self.match(TokenType.INSERT):
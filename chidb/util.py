@@ -7,44 +7,53 @@ import struct
 from typing import Tuple
 
 
+# Compiled once, so the helpers below skip the format-string lookup per call
+_UINT8 = struct.Struct('>B')
+_UINT16 = struct.Struct('>H')
+_UINT32 = struct.Struct('>I')
+_UINT64 = struct.Struct('>Q')
+
 def pack_uint8(value: int) -> bytes:
     """Pack an unsigned 8-bit integer into bytes."""
-    return struct.pack('>B', value)
+    return _UINT8.pack(value)
 
 
 def unpack_uint8(data: bytes, offset: int = 0) -> int:
     """Unpack an unsigned 8-bit integer from bytes."""
-    return struct.unpack_from('>B', data, offset)[0]
+    return _UINT8.unpack_from(data, offset)[0]
 
 
 def pack_uint16(value: int) -> bytes:
     """Pack an unsigned 16-bit integer into bytes (big-endian)."""
-    return struct.pack('>H', value)
+    return _UINT16.pack(value)
 
 
 def unpack_uint16(data: bytes, offset: int = 0) -> int:
     """Unpack an unsigned 16-bit integer from bytes (big-endian)."""
-    return struct.unpack_from('>H', data, offset)[0]
+    return _UINT16.unpack_from(data, offset)[0]
 
 
 def pack_uint32(value: int) -> bytes:
     """Pack an unsigned 32-bit integer into bytes (big-endian)."""
-    return struct.pack('>I', value)
+    return _UINT32.pack(value)
 
 
 def unpack_uint32(data: bytes, offset: int = 0) -> int:
     """Unpack an unsigned 32-bit integer from bytes (big-endian)."""
-    return struct.unpack_from('>I', data, offset)[0]
+    return _UINT32.unpack_from(data, offset)[0]
 
 
 def pack_uint64(value: int) -> bytes:
     """Pack an unsigned 64-bit integer into bytes (big-endian)."""
-    return struct.pack('>Q', value)
+    return _UINT64.pack(value)
 
 
 def unpack_uint64(data: bytes, offset: int = 0) -> int:
     """Unpack an unsigned 64-bit integer from bytes (big-endian)."""
-    return struct.unpack_from('>Q', data, offset)[0]
+    return _UINT64.unpack_from(data, offset)[0]
+
+
+_SINGLE_BYTE_VARINTS = [bytes((value,)) for value in range(0x80)]
 
 
 def pack_varint(value: int) -> bytes:
@@ -58,6 +67,10 @@ def pack_varint(value: int) -> bytes:
     if value < 0:
         raise ValueError("Varint encoding only supports non-negative integers")
     
+    # Single-byte values (lengths, type codes, small keys) need no loop
+    if value < 0x80:
+        return _SINGLE_BYTE_VARINTS[value]
+    
     result = bytearray()
     
     while value >= 0x80:
@@ -75,11 +88,17 @@ def unpack_varint(data: bytes, offset: int = 0) -> Tuple[int, int]:
     Returns:
         Tuple of (value, bytes_consumed)
     """
+    end = len(data)
+    
+    # Most varints (lengths, type codes, small keys) fit in one byte
+    if offset < end and data[offset] < 0x80:
+        return data[offset], 1
+    
     value = 0
     shift = 0
     pos = offset
     
-    while pos < len(data):
+    while pos < end:
         byte = data[pos]
         value |= (byte & 0x7F) << shift
         pos += 1
@@ -97,7 +116,7 @@ def bytes_required_varint(value: int) -> int:
     if value < 0:
         raise ValueError("Varint encoding only supports non-negative integers")
     
-    if value == 0:
+    if value < 0x80:
         return 1
     
     count = 0
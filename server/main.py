@@ -6,11 +6,13 @@ Every response includes engine logs for debuggability.
 
 import os
 import logging
+import zlib
 from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 
 from chidb.api import YesDB
@@ -42,6 +44,66 @@ async def lifespan(app: FastAPI):
     close_accounts_db()
 
 
+# ── Request decompression ────────────────────────────────────────
+
+# Largest request body accepted once decompressed, so a small gzip body
+# can't expand into an unbounded amount of memory
+MAX_DECOMPRESSED_BODY = 16 * 1024 * 1024
+
+
+class GZipRequestMiddleware:
+    """
+    ASGI middleware that decompresses request bodies sent with
+    Content-Encoding: gzip, so routes always see plain JSON.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or dict(scope["headers"]).get(b"content-encoding") != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+            body = decompressor.decompress(b"".join(chunks), MAX_DECOMPRESSED_BODY)
+            too_large = bool(decompressor.unconsumed_tail)
+        except zlib.error:
+            await _send_plain_error(send, 400, b"Invalid gzip request body")
+            return
+        if too_large:
+            await _send_plain_error(send, 413, b"Request body too large")
+            return
+
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        async def receive_body():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(dict(scope, headers=headers), receive_body, send)
+
+
+async def _send_plain_error(send, status: int, message: bytes) -> None:
+    """Send a plain-text error response straight from ASGI middleware."""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(message)).encode("latin-1"))],
+        }
+    )
+    await send({"type": "http.response.body", "body": message})
+
+
 # ── FastAPI app ──────────────────────────────────────────────────
 
 app = FastAPI(title="YesDB Cloud", version="0.1.0", lifespan=lifespan)
@@ -50,8 +112,11 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["POST", "GET"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "Content-Encoding"],
 )
+# Responses carrying many engine log lines compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(GZipRequestMiddleware)
 
 
 # ── Log capture ──────────────────────────────────────────────────
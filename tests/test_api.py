@@ -5,7 +5,12 @@ Tests for YesDB/api.py
 import pytest
 import tempfile
 import os
-from chidb.api import YesDB, connect
+import json
+from unittest.mock import MagicMock
+from chidb.api import YesDB, TableMetadata, connect
+from chidb.btree import BTree
+from chidb.record import Record
+from chidb.sql.parser import ColumnDef
 
 
 @pytest.fixture
@@ -135,6 +140,100 @@ class TestSelect:
             
             # Should return results (exact format depends on implementation)
             assert len(results) > 0
+    
+    def test_select_all_matches_vm_scan(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            for i in range(1, 301):
+                db.execute(f"INSERT INTO users VALUES ({i}, 'user{i}')")
+            
+            fast = db.execute('SELECT * FROM users')
+            # Naming the columns goes through the generated scan program
+            scanned = db.execute('SELECT id, name FROM users')
+            
+            assert [row[0].get_values() for row in fast] == [row[0].get_values() for row in scanned]
+            assert fast[-1][0].get_values() == [300, 'user300']
+    
+    def test_select_order_by_with_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i, age in enumerate([30, 25, 40, 35], start=1):
+                db.execute(f"INSERT INTO users VALUES ({i}, {age})")
+            
+            results = db.execute('SELECT * FROM users WHERE age >= 30 ORDER BY age DESC')
+            
+            assert results == [[3, 40], [4, 35], [1, 30]]
+    
+    def test_select_order_by_with_compound_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i, age in enumerate([30, 25, 40, 35], start=1):
+                db.execute(f"INSERT INTO users VALUES ({i}, {age})")
+            
+            results = db.execute('SELECT * FROM users WHERE age > 25 AND age < 40 OR id = 2 ORDER BY age')
+            
+            assert results == [[2, 25], [1, 30], [4, 35]]
+    
+    def test_select_limit_stops_scan_early(self, temp_db_path, monkeypatch):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i in range(1, 301):
+                db.execute(f"INSERT INTO users VALUES ({i}, {i % 10})")
+            
+            decoded = []
+            decode = Record.decode
+            monkeypatch.setattr(Record, 'decode', staticmethod(lambda *args: decoded.append(1) or decode(*args)))
+            
+            results = db.execute('SELECT id FROM users WHERE age = 3 LIMIT 2 OFFSET 1')
+            
+            assert results == [[13], [23]]
+            assert len(decoded) == 23
+    
+    def test_select_order_by_unprojected_column(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)')
+            db.execute("INSERT INTO users VALUES (1, 'Alice', 30)")
+            db.execute("INSERT INTO users VALUES (2, 'Bob', 25)")
+            db.execute("INSERT INTO users VALUES (3, 'Carol', 35)")
+            
+            results = db.execute('SELECT name FROM users ORDER BY age')
+            
+            assert results == [['Bob'], ['Alice'], ['Carol']]
+    
+    def test_select_order_by_multiple_columns(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, dept TEXT, age INTEGER, name TEXT)')
+            db.execute("INSERT INTO users VALUES (1, 'ops', 30, 'Dan')")
+            db.execute("INSERT INTO users VALUES (2, 'dev', 25, 'Bob')")
+            db.execute("INSERT INTO users VALUES (3, 'ops', 40, 'Eve')")
+            db.execute("INSERT INTO users VALUES (4, 'dev', 25, 'Amy')")
+            db.execute("INSERT INTO users VALUES (5, 'dev', 35, 'Cat')")
+            
+            same = db.execute('SELECT id FROM users ORDER BY dept, age, name')
+            mixed = db.execute('SELECT id FROM users ORDER BY dept ASC, age DESC, name ASC')
+            
+            assert same == [[4], [2], [5], [1], [3]]
+            assert mixed == [[5], [4], [2], [3], [1]]
+    
+    def test_select_unknown_column_raises(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (1, 'Alice')")
+            
+            with pytest.raises(ValueError):
+                db.execute('SELECT missing FROM users')
+            with pytest.raises(ValueError):
+                db.execute('SELECT id, missing FROM users ORDER BY id')
+    
+    def test_select_distinct_with_limit(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i, age in enumerate([30, 30, 25, 30, 40], start=1):
+                db.execute(f"INSERT INTO users VALUES ({i}, {age})")
+            
+            results = db.execute('SELECT DISTINCT age FROM users LIMIT 2 OFFSET 1')
+            
+            assert results == [[25], [40]]
 
 
 class TestEndToEnd:
@@ -211,6 +310,32 @@ class TestTableOperations:
             
             assert db.table_exists('users')
             assert not db.table_exists('posts')
+    
+    def test_tables_view_follows_metadata(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+            assert db.tables['users'] == db.table_metadata['users'].root_page
+            
+            db.table_metadata['users'].root_page = 99
+            assert db.tables['users'] == 99
+            
+            db.execute('DROP TABLE users')
+            assert 'users' not in db.tables
+    
+    def test_vm_and_api_share_btree(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            for i in range(1, 301):
+                db.execute(f"INSERT INTO users VALUES ({i}, 'user{i}')")
+            db.execute("UPDATE users SET name = 'x' WHERE id = 1")
+            
+            meta = db.table_metadata['users']
+            btree = db.dbm.btrees[meta.root_page]
+            assert db._get_btree(meta) is btree
+            assert list(db.dbm.btrees.values()).count(btree) == 1
+            
+            db.execute('DROP TABLE users')
+            assert meta.root_page not in db.dbm.btrees
 
 
 class TestErrorHandling:
@@ -232,6 +357,35 @@ class TestErrorHandling:
                 db.execute("INSERT INTO nonexistent VALUES (1)")
 
 
+class TestTableMetadata:
+    """Test table metadata serialization."""
+    
+    def test_serialize_reuses_json_until_changed(self):
+        meta = TableMetadata(name='users', root_page=2, columns=[ColumnDef('id', 'INTEGER')])
+        first = meta.serialize()
+        
+        assert meta.serialize() is first
+        assert TableMetadata.from_dict(json.loads(first)) == meta
+        assert ' ' not in first
+        
+        meta.next_auto_increment += 1
+        assert json.loads(meta.serialize())['next_auto_increment'] == 2
+        
+        meta.columns.append(ColumnDef('name', 'TEXT'))
+        meta.reindex_columns()
+        assert len(json.loads(meta.serialize())['columns']) == 2
+    
+    def test_from_json_keeps_catalog_text(self):
+        stored = '{"name": "users", "root_page": 2, "columns": []}'
+        meta = TableMetadata.from_json(stored)
+        
+        assert meta.name == 'users'
+        assert meta.serialize() is stored
+        
+        meta.root_page = 3
+        assert json.loads(meta.serialize())['root_page'] == 3
+
+
 class TestPersistence:
     """Test data persistence."""
     
@@ -251,6 +405,61 @@ class TestPersistence:
             
             results = db.execute('SELECT * FROM users')
             assert len(results) == 1
+    
+    def test_drop_table_persists(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+            db.execute('CREATE TABLE posts (id INTEGER)')
+            db.execute('DROP TABLE users')
+        
+        with YesDB(temp_db_path) as db:
+            assert db.get_table_names() == ['posts']
+    
+    def test_auto_increment_persists(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (NULL, 'Alice')")
+            db.execute("INSERT INTO users VALUES (NULL, 'Bob')")
+        
+        with YesDB(temp_db_path) as db:
+            assert db.table_metadata['users'].next_auto_increment == 3
+            assert len(db.catalog_btree.scan()) == 1
+    
+    def test_unchanged_catalog_is_not_rewritten(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+        
+        with YesDB(temp_db_path) as db:
+            db.execute('SELECT * FROM users')
+            db.catalog_btree = MagicMock()
+            db._save_all_metadata()
+            
+            assert db.catalog_btree.method_calls == []
+    
+    def test_insert_root_split_persists(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            first_root = db.table_metadata['users'].root_page
+            for i in range(1, 301):
+                db.execute(f"INSERT INTO users VALUES ({i}, 'user{i}')")
+            
+            assert db.table_metadata['users'].root_page != first_root
+        
+        with YesDB(temp_db_path) as db:
+            assert len(db.execute('SELECT * FROM users')) == 300
+            db.catalog_btree = MagicMock()
+            db.execute('SELECT id FROM users WHERE id = 150')
+            
+            assert db.catalog_btree.method_calls == []
+    
+    def test_column_index_survives_alter_and_reopen(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+            db.execute('ALTER TABLE users ADD COLUMN age INTEGER')
+            assert db.table_metadata['users'].column_index == {'id': 0, 'name': 1, 'age': 2}
+        
+        with YesDB(temp_db_path) as db:
+            assert db.table_metadata['users'].column_index == {'id': 0, 'name': 1, 'age': 2}
 
 
 class TestComplexQueries:
@@ -277,4 +486,207 @@ class TestComplexQueries:
             db.execute("INSERT INTO mixed VALUES (2, 'Bob', 0)")
             
             results = db.execute('SELECT * FROM mixed')
-            assert len(results) == 2
\ No newline at end of file
+            assert len(results) == 2
+
+
+class TestUpdateDelete:
+    """Test UPDATE and DELETE functionality."""
+    
+    def _rows(self, db, table):
+        return [row[0].get_values() for row in db.execute(f'SELECT * FROM {table}')]
+    
+    def test_update_with_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)')
+            db.execute("INSERT INTO users VALUES (1, 'Alice', 30)")
+            db.execute("INSERT INTO users VALUES (2, 'Bob', 25)")
+            
+            db.execute("UPDATE users SET age = 31, name = 'Al' WHERE id = 1")
+            
+            assert self._rows(db, 'users') == [[1, 'Al', 31], [2, 'Bob', 25]]
+    
+    def test_update_without_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            db.execute("INSERT INTO users VALUES (1, 30)")
+            db.execute("INSERT INTO users VALUES (2, 25)")
+            
+            db.execute("UPDATE users SET age = 0")
+            
+            assert self._rows(db, 'users') == [[1, 0], [2, 0]]
+    
+    def test_update_comparison_operator(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i in range(1, 6):
+                db.execute(f"INSERT INTO users VALUES ({i}, {i * 10})")
+            
+            db.execute("UPDATE users SET age = 0 WHERE age >= 30")
+            
+            assert self._rows(db, 'users') == [[1, 10], [2, 20], [3, 0], [4, 0], [5, 0]]
+    
+    def test_update_that_splits_root_keeps_all_rows(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)')
+            for i in range(1, 41):
+                db.execute(f"INSERT INTO notes VALUES ({i}, 'a')")
+            
+            db.execute(f"UPDATE notes SET body = '{'x' * 80}'")
+            
+            rows = self._rows(db, 'notes')
+            assert len(rows) == 40
+            assert all(body == 'x' * 80 for _, body in rows)
+        
+        with YesDB(temp_db_path) as db:
+            assert len(self._rows(db, 'notes')) == 40
+    
+    def test_update_wide_table_resolves_assignments_once(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            columns = ', '.join(f'c{i} INTEGER' for i in range(20))
+            db.execute(f'CREATE TABLE wide (id INTEGER PRIMARY KEY, {columns})')
+            for key in range(1, 4):
+                db.execute(f"INSERT INTO wide VALUES ({key}, {', '.join(['0'] * 20)})")
+            
+            resolve = db._resolve_assignments
+            calls = []
+            db._resolve_assignments = lambda *args: calls.append(args) or resolve(*args)
+            db.execute("UPDATE wide SET c19 = 7, c3 = 5, missing = 1")
+            
+            assert len(calls) == 1
+            for row in self._rows(db, 'wide'):
+                assert row[4] == 5 and row[20] == 7
+    
+    def test_delete_with_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (1, 'Alice')")
+            db.execute("INSERT INTO users VALUES (2, 'Bob')")
+            db.execute("INSERT INTO users VALUES (3, 'Carol')")
+            
+            db.execute("DELETE FROM users WHERE name != 'Bob'")
+            
+            assert self._rows(db, 'users') == [[2, 'Bob']]
+    
+    def test_delete_without_where(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY)')
+            db.execute("INSERT INTO users VALUES (1)")
+            db.execute("INSERT INTO users VALUES (2)")
+            
+            db.execute("DELETE FROM users")
+            
+            assert db.execute('SELECT * FROM users') == []
+    
+    def test_delete_with_and_or(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i in range(1, 6):
+                db.execute(f"INSERT INTO users VALUES ({i}, {i * 10})")
+            
+            db.execute("DELETE FROM users WHERE age > 10 AND age < 40 OR id = 5")
+            
+            assert self._rows(db, 'users') == [[1, 10], [4, 40]]
+    
+    def test_where_unknown_column_matches_nothing(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY)')
+            db.execute("INSERT INTO users VALUES (1)")
+            
+            db.execute("DELETE FROM users WHERE missing = 1")
+            
+            assert self._rows(db, 'users') == [[1]]
+    
+    def test_primary_key_where_uses_point_lookup(self, temp_db_path, monkeypatch):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i in range(1, 301):
+                db.execute(f"INSERT INTO users VALUES ({i}, {i})")
+            
+            def no_scan(self):
+                raise AssertionError("full table scan")
+            monkeypatch.setattr(BTree, 'iter_scan', no_scan)
+            
+            db.execute("UPDATE users SET age = 0 WHERE id = 150")
+            db.execute("DELETE FROM users WHERE id = 151")
+            db.execute("DELETE FROM users WHERE id = 999")
+            
+            monkeypatch.undo()
+            rows = self._rows(db, 'users')
+            assert len(rows) == 299
+            assert [150, 0] in rows
+            assert [151, 151] not in rows
+    
+    def test_compiled_scan_filters_rows(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, age INTEGER)')
+            for i in range(1, 21):
+                db.execute(f"INSERT INTO users VALUES ({i}, {i % 4})")
+            
+            where = db._parse("DELETE FROM users WHERE age = 2 OR id < 3")[1].where
+            meta = db.table_metadata['users']
+            rows = BTree(db.pager, db.tables['users']).scan()
+            
+            matched = db._compile_scan(where, meta)(rows)
+            assert [key for key, _ in matched] == [1, 2, 6, 10, 14, 18]
+            assert all(record.values[0] == key for key, record in matched)
+
+
+class TestStatementCache:
+    """Test the prepared-statement cache."""
+    
+    def test_repeated_query_hits_cache(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+            db.execute('SELECT * FROM users')
+            db.execute('SELECT * FROM users')
+            
+            assert db.cache_stats()['hits'] == 1
+    
+    def test_trailing_semicolon_shares_entry(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+            db.execute('SELECT * FROM users')
+            db.execute('  SELECT * FROM users; ')
+            
+            assert db.cache_stats()['hits'] == 1
+    
+    def test_cached_insert_generates_new_keys(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (NULL, 'Alice')")
+            db.execute("INSERT INTO users VALUES (NULL, 'Alice')")
+            
+            results = db.execute('SELECT * FROM users')
+            assert len(results) == 2
+    
+    def test_inserts_with_different_values_share_plan(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (NULL, 'Alice')")
+            db.execute("INSERT INTO users VALUES (NULL, 'Bob')")
+            
+            assert db.cache_stats()['plans'] == 1
+            results = db.execute('SELECT * FROM users')
+            assert [row[0].get_values() for row in results] == [[1, 'Alice'], [2, 'Bob']]
+    
+    def test_select_program_is_reused(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)')
+            db.execute("INSERT INTO users VALUES (1, 'Alice')")
+            db.execute('SELECT id, name FROM users')
+            
+            generate = db.codegen.generate
+            db.codegen.generate = lambda ast: pytest.fail("SELECT was recompiled")
+            db.execute("INSERT INTO users VALUES (2, 'Bob')")
+            results = db.execute('SELECT id, name FROM users;')
+            db.codegen.generate = generate
+            
+            assert len(results) == 2
+    
+    def test_schema_change_clears_cache(self, temp_db_path):
+        with YesDB(temp_db_path) as db:
+            db.execute('CREATE TABLE users (id INTEGER)')
+            db.execute('SELECT * FROM users')
+            db.execute('CREATE TABLE posts (id INTEGER)')
+            
+            assert db.cache_stats()['size'] == 0
@@ -8,6 +8,7 @@ import os
 from chidb.pager import Pager
 from chidb.btree import BTree, BTreeNode, NODE_TYPE_LEAF, NODE_TYPE_INTERNAL
 from chidb.record import Record
+from chidb.util import pack_varint
 
 
 @pytest.fixture
@@ -107,6 +108,58 @@ class TestBTreeInsertion:
             result = btree.search(i)
             assert result is not None
             assert result.get_value(0) == i
+    
+    def test_insert_separator_key_updates(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i]))
+        
+        root = BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size())
+        separator = root.read_key(0)
+        btree.insert(separator, Record(["updated"]))
+        
+        assert [key for key, _ in btree.scan()] == list(range(300))
+        assert btree.search(separator).get_value(0) == "updated"
+    
+    def test_split_writes_each_page_once(self, temp_db, monkeypatch):
+        btree = BTree(temp_db)
+        for i in range(100):
+            btree.insert(i, Record([i]))
+        
+        written = []
+        write_page = temp_db.write_page
+        monkeypatch.setattr(temp_db, 'write_page', lambda page_id, data: written.append(page_id) or write_page(page_id, data))
+        
+        # The 101st key splits the root leaf: old leaf, new leaf and new root
+        btree.insert(100, Record([100]))
+        
+        assert sorted(written) == sorted(set(written))
+        assert len(written) == 3
+        assert [key for key, _ in btree.scan()] == list(range(101))
+    
+    def test_sequential_inserts_reuse_last_leaf(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(500):
+            btree.insert(i, Record([i]))
+        
+        assert btree._leaf_hint is not None
+        assert [key for key, _ in btree.scan()] == list(range(500))
+        assert all(btree.search(i) == Record([i]) for i in range(500))
+    
+    def test_leaf_hint_survives_splits_by_another_btree(self, temp_db):
+        first = BTree(temp_db)
+        second = BTree(temp_db, first.root_page)
+        
+        # Interleave two instances on one tree so each splits leaves
+        # the other has cached
+        for i in range(0, 1000, 2):
+            first.insert(i, Record([i]))
+            second.root_page = first.root_page
+            second.insert(i + 1, Record([i + 1]))
+            first.root_page = second.root_page
+        
+        assert [key for key, _ in first.scan()] == list(range(1000))
+        assert all(second.search(i) == Record([i]) for i in range(1000))
 
 
 class TestBTreeSearch:
@@ -193,6 +246,31 @@ class TestBTreeScan:
         for i, (key, record) in enumerate(results):
             assert key == i
             assert record.get_value(0) == i
+    
+    def test_iter_scan_is_lazy(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i, "x" * 20]))
+        
+        rows = btree.iter_scan()
+        assert next(rows)[0] == 0
+        assert next(rows)[0] == 1
+        assert [key for key, _ in rows] == list(range(2, 300))
+    
+    def test_iter_keys(self, temp_db):
+        btree = BTree(temp_db)
+        for key in reversed(range(300)):
+            btree.insert(key, Record([key, "x" * 20]))
+        
+        assert list(btree.iter_keys()) == list(range(300))
+    
+    def test_scan_and_search_negative_last_value(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(5):
+            btree.insert(i, Record([i, -1]))
+        
+        assert [record.get_values() for _, record in btree.scan()] == [[i, -1] for i in range(5)]
+        assert btree.search(3) == Record([3, -1])
 
 
 class TestBTreeNode:
@@ -241,6 +319,59 @@ class TestBTreeNode:
         assert node.find_key_index(15) == 1  # Between first and second
         assert node.find_key_index(25) == 2  # Between second and third
         assert node.find_key_index(35) == 3  # After last
+    
+    def test_find_key_index_across_varint_widths(self, temp_db):
+        btree = BTree(temp_db)
+        keys = [5, 127, 128, 300, 16383, 16384, 2 ** 40]
+        for key in keys:
+            btree.insert(key, Record([key]))
+        
+        page_data = temp_db.read_page(btree.root_page)
+        node = BTreeNode(btree.root_page, page_data, temp_db.get_page_size())
+        
+        for i, key in enumerate(keys):
+            assert node.find_key_index(key) == i
+            assert node.find_key_index(key + 1) == i + 1
+    
+    def test_read_key_matches_read_cell(self, temp_db):
+        btree = BTree(temp_db)
+        for key in [5, 200, 70000]:
+            btree.insert(key, Record([key, "x" * 50]))
+        
+        page_data = temp_db.read_page(btree.root_page)
+        node = BTreeNode(btree.root_page, page_data, temp_db.get_page_size())
+        
+        assert [node.read_key(i) for i in range(node.num_keys)] == [5, 200, 70000]
+        assert all(node.read_key(i) == node.read_cell(i)[0] for i in range(node.num_keys))
+    
+    def test_find_child_routes_separator_right(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i]))
+        
+        root = BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size())
+        assert root.is_internal()
+        cells = root.read_cells()
+        separator, left_child = cells[0]
+        
+        assert root.find_child(separator - 1) == left_child
+        assert root.find_child(separator) == (cells[1][1] if len(cells) > 1 else root.right_page)
+        assert root.find_child(10 ** 6) == root.right_page
+    
+    def test_write_cells_matches_sequential_inserts(self, temp_db):
+        cells = [(key, Record([key, "v" * key]).encode()) for key in range(1, 20)]
+        
+        inserted = BTree(temp_db)
+        node = BTreeNode(inserted.root_page, temp_db.read_page(inserted.root_page), temp_db.get_page_size())
+        for i, (key, data) in enumerate(cells):
+            inserted._insert_leaf_cell(node, i, key, data)
+        
+        written = BTree(temp_db)
+        other = BTreeNode(written.root_page, temp_db.read_page(written.root_page), temp_db.get_page_size())
+        written._write_cells(other, [pack_varint(key) + pack_varint(len(data)) + data for key, data in cells])
+        
+        assert other.num_keys == node.num_keys
+        assert other.page_data == node.page_data
 
 
 class TestBTreePersistence:
@@ -278,6 +409,135 @@ class TestBTreePersistence:
                 os.unlink(path)
 
 
+class TestBTreeDelete:
+    """Test B-tree deletion."""
+    
+    def test_delete_many_from_leaf(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(10):
+            btree.insert(i, Record([i]))
+        
+        assert btree.delete_many([1, 4, 5, 42]) == 3
+        
+        assert [key for key, _ in btree.scan()] == [0, 2, 3, 6, 7, 8, 9]
+    
+    def test_delete_many_across_pages(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(500):
+            btree.insert(i, Record([i, "x" * 20]))
+        
+        doomed = list(range(0, 500, 3))
+        assert btree.delete_many(doomed) == len(doomed)
+        
+        remaining = [key for key, _ in btree.scan()]
+        assert remaining == [i for i in range(500) if i % 3 != 0]
+        assert btree.search(3) is None
+        assert btree.search(4).get_value(0) == 4
+    
+    def test_delete_separator_key(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i, "x" * 20]))
+        
+        root = BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size())
+        separator, _ = root.read_cell(0)
+        
+        assert btree.delete(separator)
+        assert btree.search(separator) is None
+    
+    def test_delete_many_empty(self, temp_db):
+        btree = BTree(temp_db)
+        btree.insert(1, Record([1]))
+        
+        assert btree.delete_many([]) == 0
+        assert len(btree.scan()) == 1
+
+
+class TestBTreeUpdate:
+    """Test B-tree updates."""
+    
+    def test_update_same_size_in_place(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(10):
+            btree.insert(i, Record([i, "aaaa"]))
+        pages = temp_db.get_num_pages()
+        
+        for _ in range(500):
+            assert btree.update(5, Record([5, "bbbb"]))
+        
+        assert btree.search(5).get_value(1) == "bbbb"
+        assert temp_db.get_num_pages() == pages
+    
+    def test_update_larger_record(self, temp_db):
+        btree = BTree(temp_db)
+        btree.insert(1, Record([1, "a"]))
+        
+        assert btree.update(1, Record([1, "a" * 100]))
+        assert btree.search(1).get_value(1) == "a" * 100
+    
+    def test_update_grows_records_until_split(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(40):
+            btree.insert(i, Record([i, "a"]))
+        
+        for i in range(40):
+            assert btree.update(i, Record([i, "b" * 100]))
+        
+        rows = btree.scan()
+        assert [key for key, _ in rows] == list(range(40))
+        assert all(record.get_value(1) == "b" * 100 for _, record in rows)
+        assert BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size()).is_internal()
+    
+    def test_updates_reclaim_dead_space_instead_of_splitting(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(10):
+            btree.insert(i, Record([i, "a"]))
+        
+        # Each update outgrows the previous cell, leaving it behind as dead space
+        for size in range(2, 200):
+            assert btree.update(3, Record([3, "b" * size]))
+        
+        root = BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size())
+        assert root.is_leaf()
+        assert btree.search(3).get_value(1) == "b" * 199
+        assert [key for key, _ in btree.scan()] == list(range(10))
+    
+    def test_update_missing_key(self, temp_db):
+        btree = BTree(temp_db)
+        btree.insert(1, Record([1]))
+        
+        assert not btree.update(2, Record([2]))
+    
+    def test_update_separator_key(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i, "x" * 20]))
+        
+        root = BTreeNode(btree.root_page, temp_db.read_page(btree.root_page), temp_db.get_page_size())
+        separator, _ = root.read_cell(0)
+        
+        assert btree.update(separator, Record([separator, "y"]))
+        assert btree.search(separator).get_value(1) == "y"
+    
+    def test_update_many(self, temp_db):
+        btree = BTree(temp_db)
+        for i in range(300):
+            btree.insert(i, Record([i, "x" * 20]))
+        
+        updates = [(i, Record([i, "y" * 20])) for i in range(0, 300, 3)]
+        updates.append((299, Record([299, "z" * 200])))
+        updates.append((500, Record([500, "missing"])))
+        
+        assert btree.update_many(updates) == 101
+        
+        rows = btree.scan()
+        assert [key for key, _ in rows] == list(range(300))
+        for key, record in rows:
+            expected = "z" * 200 if key == 299 else ("y" if key % 3 == 0 else "x") * 20
+            assert record.get_value(1) == expected
+        assert btree.search(500) is None
+
+
 class TestBTreeEdgeCases:
     """Test edge cases."""
     
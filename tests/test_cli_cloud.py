@@ -1,12 +1,14 @@
 """Tests for chidb/cli/cloud.py — Cloud CLI commands."""
 
+import io
 import json
 import os
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 
-from chidb.cli.cloud import main, _print_logs, PROJECT_CONFIG_FILE
+from chidb.cli.cloud import main, _print_logs, _prompt, _session, PROJECT_CONFIG_FILE
+from chidb.client import TimeoutHTTPAdapter, DEFAULT_TIMEOUT
 
 
 @pytest.fixture(autouse=True)
@@ -31,6 +33,9 @@ def fresh_server(tmp_path, monkeypatch):
     monkeypatch.setattr("chidb.cli.cloud.CREDENTIALS_PATH", cred_path)
     monkeypatch.setattr("chidb.client.CREDENTIALS_PATH", cred_path)
 
+    # Each test patches in its own requests module, so start a fresh session
+    monkeypatch.setattr("chidb.cli.cloud._SESSION", None)
+
     # Run CLI from a temp working directory
     work_dir = str(tmp_path / "project")
     os.makedirs(work_dir)
@@ -61,7 +66,7 @@ def _patch_requests_with_test_client(test_client):
     """
     mock_requests = MagicMock()
 
-    def _post(url, json=None, headers=None, **kwargs):
+    def _post(url, json=None, data=None, headers=None, **kwargs):
         # Extract path from URL
         path = "/" + url.split("/", 3)[-1] if "/" in url else url
         # Remove the scheme://host part
@@ -72,7 +77,7 @@ def _patch_requests_with_test_client(test_client):
                 if slash_idx >= 0:
                     path = after_scheme[slash_idx:]
                 break
-        return test_client.post(path, json=json, headers=headers)
+        return test_client.post(path, json=json, content=data, headers=headers)
 
     def _get(url, headers=None, **kwargs):
         path = "/" + url.split("/", 3)[-1] if "/" in url else url
@@ -87,7 +92,10 @@ def _patch_requests_with_test_client(test_client):
 
     mock_requests.post = _post
     mock_requests.get = _get
+    # The CLI sends through a shared session; let it route the same way
+    mock_requests.Session.return_value = mock_requests
     mock_requests.ConnectionError = ConnectionError
+    mock_requests.Timeout = TimeoutError
     return mock_requests
 
 
@@ -106,6 +114,26 @@ def _signup_user(test_client, tmp_path):
     return api_key
 
 
+# ── session ──────────────────────────────────────────────────────
+
+
+class TestSession:
+    def test_session_is_created_once(self):
+        mock_req = MagicMock()
+        with patch("chidb.cli.cloud.requests", mock_req):
+            assert _session() is _session()
+        mock_req.Session.assert_called_once_with()
+        assert mock_req.Session.return_value.mount.call_count == 2
+
+    def test_adapter_applies_default_timeout(self):
+        adapter = TimeoutHTTPAdapter()
+        with patch("requests.adapters.HTTPAdapter.send") as send:
+            adapter.send(MagicMock())
+            adapter.send(MagicMock(), timeout=1)
+        assert send.call_args_list[0].kwargs["timeout"] == DEFAULT_TIMEOUT
+        assert send.call_args_list[1].kwargs["timeout"] == 1
+
+
 # ── print_logs ───────────────────────────────────────────────────
 
 
@@ -121,6 +149,10 @@ class TestPrintLogs:
         assert "Parsing SQL" in out
         assert "chidb.btree" in out
 
+    def test_missing_fields_use_defaults(self, capsys):
+        _print_logs([{"message": "hello"}])
+        assert capsys.readouterr().out == "   - chidb.unknown - INFO - hello\n"
+
     def test_empty_logs(self, capsys):
         _print_logs([])
         assert capsys.readouterr().out == ""
@@ -134,8 +166,7 @@ class TestSignup:
         mock_req = _patch_requests_with_test_client(test_client)
 
         with patch("chidb.cli.cloud.requests", mock_req), \
-             patch("builtins.input", return_value="alice@uni.edu"), \
-             patch("getpass.getpass", side_effect=["secret", "secret"]):
+             patch("sys.stdin", io.StringIO("alice@uni.edu\nsecret\nsecret\n")):
             result = main(["signup", "--server", "https://testserver"])
 
         assert result == 0
@@ -156,21 +187,18 @@ class TestSignup:
 
         # First signup
         with patch("chidb.cli.cloud.requests", mock_req), \
-             patch("builtins.input", return_value="dup@uni.edu"), \
-             patch("getpass.getpass", side_effect=["pass", "pass"]):
+             patch("sys.stdin", io.StringIO("dup@uni.edu\npass\npass\n")):
             main(["signup", "--server", "https://testserver"])
 
         # Second signup — same email
         with patch("chidb.cli.cloud.requests", mock_req), \
-             patch("builtins.input", return_value="dup@uni.edu"), \
-             patch("getpass.getpass", side_effect=["pass2", "pass2"]):
+             patch("sys.stdin", io.StringIO("dup@uni.edu\npass2\npass2\n")):
             result = main(["signup", "--server", "https://testserver"])
 
         assert result == 1
 
     def test_signup_password_mismatch(self, capsys):
-        with patch("builtins.input", return_value="x@y.com"), \
-             patch("getpass.getpass", side_effect=["pass1", "pass2"]):
+        with patch("sys.stdin", io.StringIO("x@y.com\npass1\npass2\n")):
             result = main(["signup", "--server", "https://testserver"])
         assert result == 1
         assert "do not match" in capsys.readouterr().err
@@ -187,8 +215,7 @@ class TestLogin:
         mock_req = _patch_requests_with_test_client(test_client)
 
         with patch("chidb.cli.cloud.requests", mock_req), \
-             patch("builtins.input", return_value="test@uni.edu"), \
-             patch("getpass.getpass", return_value="pass123"):
+             patch("sys.stdin", io.StringIO("test@uni.edu\npass123\n")):
             result = main(["login", "--server", "https://testserver"])
 
         assert result == 0
@@ -200,8 +227,7 @@ class TestLogin:
         mock_req = _patch_requests_with_test_client(test_client)
 
         with patch("chidb.cli.cloud.requests", mock_req), \
-             patch("builtins.input", return_value="test@uni.edu"), \
-             patch("getpass.getpass", return_value="wrong"):
+             patch("sys.stdin", io.StringIO("test@uni.edu\nwrong\n")):
             result = main(["login", "--server", "https://testserver"])
 
         assert result == 1
@@ -274,6 +300,33 @@ class TestPush:
         assert "posts" in out
         assert "2 statement(s) pushed" in out
 
+    def test_push_large_schema_is_compressed(self, test_client, tmp_path, capsys):
+        _signup_user(test_client, tmp_path)
+        mock_req = _patch_requests_with_test_client(test_client)
+
+        with patch("chidb.cli.cloud.requests", mock_req):
+            main(["init", "bigschema"])
+
+        with open("yesdb/schema.py", "w") as f:
+            f.write("from chidb.schema import Table, Column, Integer, Text\n\n")
+            for i in range(30):
+                f.write(
+                    f"table_{i} = Table('table_{i}', [\n"
+                    "    Column('id', Integer, primary_key=True),\n"
+                    "    Column('description', Text),\n"
+                    "])\n"
+                )
+
+        sent = []
+        post = mock_req.post
+        mock_req.post = lambda url, **kwargs: sent.append(kwargs.get("headers", {})) or post(url, **kwargs)
+        with patch("chidb.cli.cloud.requests", mock_req):
+            result = main(["push"])
+
+        assert result == 0
+        assert sent[-1].get("Content-Encoding") == "gzip"
+        assert "30 statement(s) pushed" in capsys.readouterr().out
+
     def test_push_no_project(self, capsys):
         result = main(["push"])
         assert result == 1
@@ -328,6 +381,74 @@ class TestDatabases:
         assert "Not logged in" in capsys.readouterr().err
 
 
+# ── prompt ───────────────────────────────────────────────────────
+
+
+class TestPrompt:
+    def test_piped_input_reads_stdin(self):
+        with patch("sys.stdin", io.StringIO("a@b.c\n")), \
+             patch("getpass.getpass") as gp:
+            assert _prompt("Password: ", secret=True) == "a@b.c"
+            with pytest.raises(EOFError):
+                _prompt("Password: ", secret=True)
+        gp.assert_not_called()
+
+    def test_terminal_uses_getpass_for_secrets(self):
+        tty = MagicMock()
+        tty.isatty.return_value = True
+        with patch("sys.stdin", tty), patch("getpass.getpass", return_value="pw") as gp:
+            assert _prompt("Password: ", secret=True) == "pw"
+        gp.assert_called_once_with("Password: ")
+
+
+# ── shell ────────────────────────────────────────────────────────
+
+
+class TestShell:
+    def test_tables_listed(self, capsys):
+        conn = MagicMock()
+        conn.get_table_names.return_value = ["users", "posts"]
+
+        with patch("chidb.cli.cloud.requests", MagicMock()), \
+                patch("chidb.cli.cloud.CloudConnection", return_value=conn), \
+                patch("sys.stdin", io.StringIO(".tables\nexit\n")):
+            result = main(["shell", "proj1"])
+
+        assert result == 0
+        assert "  users\n  posts\n" in capsys.readouterr().out
+
+    def test_tables_timeout_keeps_shell_running(self, capsys):
+        mock_req = MagicMock()
+        mock_req.Timeout = TimeoutError
+        conn = MagicMock()
+        conn.get_table_names.side_effect = TimeoutError()
+
+        with patch("chidb.cli.cloud.requests", mock_req), \
+                patch("chidb.cli.cloud.CloudConnection", return_value=conn), \
+                patch("sys.stdin", io.StringIO(".tables\nexit\n")):
+            result = main(["shell", "proj1"])
+
+        assert result == 0
+        out = capsys.readouterr().out
+        assert "did not respond in time" in out
+        assert "Goodbye!" in out
+        conn.close.assert_called_once_with()
+
+    def test_rows_printed(self, capsys):
+        conn = MagicMock()
+        conn.execute.return_value.rows = [[1, "Alice"], [2, None]]
+        conn.execute.return_value.row_count = 2
+        conn.execute.return_value.logs = []
+
+        with patch("chidb.cli.cloud.requests", MagicMock()), \
+                patch("chidb.cli.cloud.CloudConnection", return_value=conn), \
+                patch("sys.stdin", io.StringIO("SELECT * FROM users\nexit\n")):
+            result = main(["shell", "proj1"])
+
+        assert result == 0
+        assert "1 | Alice\n2 | NULL\n(2 rows)\n" in capsys.readouterr().out
+
+
 # ── No command shows help ────────────────────────────────────────
 
 
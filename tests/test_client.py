@@ -10,6 +10,8 @@ from chidb.client import (
     CloudConnection,
     load_credentials,
     save_credentials,
+    TimeoutHTTPAdapter,
+    DEFAULT_TIMEOUT,
 )
 
 
@@ -93,10 +95,34 @@ class TestCredentials:
         assert creds["api_key"] == "yesdb_key123"
         assert creds["server_url"] == "https://example.com"
 
+    def test_load_reuses_parsed_file_until_saved(self, tmp_path):
+        cred_path = str(tmp_path / "credentials.json")
+        save_credentials("a@b.com", "yesdb_key1", "https://example.com", path=cred_path)
+        assert load_credentials(path=cred_path)["api_key"] == "yesdb_key1"
+
+        with patch("json.load") as json_load:
+            creds = load_credentials(path=cred_path)
+        json_load.assert_not_called()
+        assert creds["api_key"] == "yesdb_key1"
+
+        save_credentials("a@b.com", "yesdb_key2", "https://example.com", path=cred_path)
+        assert load_credentials(path=cred_path)["api_key"] == "yesdb_key2"
+
     def test_load_missing_file_raises(self, tmp_path):
         with pytest.raises(FileNotFoundError, match="No credentials found"):
             load_credentials(path=str(tmp_path / "nonexistent.json"))
 
+    def test_failed_save_keeps_old_file(self, tmp_path):
+        cred_path = str(tmp_path / "credentials.json")
+        save_credentials("a@b.com", "yesdb_key1", "https://example.com", path=cred_path)
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                save_credentials("a@b.com", "yesdb_key2", "https://example.com", path=cred_path)
+
+        assert load_credentials(path=cred_path)["api_key"] == "yesdb_key1"
+        assert os.listdir(tmp_path) == ["credentials.json"]
+
     def test_save_creates_directory(self, tmp_path):
         cred_path = str(tmp_path / "deep" / "nested" / "creds.json")
         save_credentials("x@y.com", "key", "https://srv.com", path=cred_path)
@@ -163,6 +189,35 @@ class TestCloudConnectionUnit:
         with conn as c:
             assert c is conn
 
+    def test_shared_session_is_not_closed(self):
+        session = MagicMock()
+        conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com", session=session)
+        assert conn.session is session
+        conn.close()
+        session.close.assert_not_called()
+
+    def test_shared_session_headers_unchanged(self):
+        import requests
+        session = requests.Session()
+        before = dict(session.headers)
+        conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com", session=session)
+        assert dict(session.headers) == before
+
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {"rows": [], "logs": [], "row_count": 0}
+        with patch.object(session, "post", return_value=mock_resp) as post:
+            conn.execute("SELECT 1")
+        assert post.call_args.kwargs["headers"]["Authorization"] == "Bearer k"
+
+    def test_own_session_is_pooled_with_timeout(self):
+        conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com")
+        adapter = conn.session.get_adapter("https://srv.com")
+        assert isinstance(adapter, TimeoutHTTPAdapter)
+        assert adapter.timeout == DEFAULT_TIMEOUT
+        assert adapter.max_retries.total == 3
+        assert "gzip" in conn.session.headers["Accept-Encoding"]
+
     def test_execute_calls_correct_endpoint(self):
         conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com")
         mock_resp = MagicMock()
@@ -243,6 +298,38 @@ class TestCloudConnectionUnit:
         assert conn.table_exists("nope") is False
 
 
+    def test_table_names_cached_until_ddl(self):
+        conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com")
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {"tables": ["users"], "logs": []}
+        conn.session.get = MagicMock(return_value=mock_resp)
+        conn.session.post = MagicMock(return_value=mock_resp)
+
+        assert conn.table_exists("users")
+        assert not conn.table_exists("posts")
+        conn.execute("SELECT * FROM users")
+        assert conn.get_table_names() == ["users"]
+        assert conn.session.get.call_count == 1
+
+        conn.execute("create table posts (id INTEGER)")
+        conn.get_table_names()
+        assert conn.session.get.call_count == 2
+
+    def test_table_names_refetched_after_ttl(self):
+        conn = CloudConnection("mydb", api_key="k", server_url="https://srv.com")
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.json.return_value = {"tables": ["users"], "logs": []}
+        conn.session.get = MagicMock(return_value=mock_resp)
+
+        with patch("chidb.client.time.monotonic", side_effect=[100.0, 110.0, 200.0]):
+            conn.get_table_names()
+            conn.get_table_names()
+            conn.get_table_names()
+        assert conn.session.get.call_count == 2
+
+
 # ── CloudConnection integration test (against real FastAPI server) ──
 
 
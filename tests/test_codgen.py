@@ -9,6 +9,7 @@ from chidb.sql.parser import (
 )
 from chidb.sql.codegen import CodeGenerator, generate_code
 from chidb.dbm import Opcode
+from chidb.api import TableMetadata
 
 
 class TestCodeGeneratorBasics:
@@ -158,6 +159,34 @@ class TestInsertCodeGeneration:
         # Should have NULL instruction
         opcodes = [instr.opcode for instr in instructions]
         assert Opcode.NULL in opcodes
+    
+    def test_insert_template_uses_variables(self):
+        stmt = InsertStatement(table='users', values=[1, 'John'])
+        codegen = CodeGenerator({'users': 1})
+        
+        instructions = codegen.generate_insert_template(stmt)
+        
+        variables = [instr.p1 for instr in instructions if instr.opcode == Opcode.VARIABLE]
+        assert variables == [0, 1, 2]
+        assert Opcode.STRING not in [instr.opcode for instr in instructions]
+    
+    def test_bind_insert_does_not_modify_statement(self):
+        stmt = InsertStatement(table='users', values=[None, 'John'])
+        codegen = CodeGenerator({'users': 1})
+        codegen.table_metadata = {
+            'users': TableMetadata(
+                name='users',
+                root_page=1,
+                columns=[ColumnDef('id', 'INTEGER', True), ColumnDef('name', 'TEXT')],
+                primary_key_column='id',
+                next_auto_increment=5
+            )
+        }
+        
+        params = codegen.bind_insert(stmt)
+        
+        assert params == [5, 5, 'John']
+        assert stmt.values == [None, 'John']
 
 
 class TestCreateTableCodeGeneration:
@@ -43,6 +43,17 @@ class TestInstruction:
     def test_instruction_repr(self):
         instr = Instruction(Opcode.HALT)
         assert "HALT" in repr(instr)
+    
+    def test_instruction_repr_formatted_once(self):
+        instr = Instruction(Opcode.STRING, p4="hi")
+        assert repr(instr) == "STRING(0, 0, 0, 'hi')"
+        assert repr(instr) is repr(instr)
+        assert instr == Instruction(Opcode.STRING, p4="hi")
+    
+    def test_instruction_is_immutable(self):
+        instr = Instruction(Opcode.INTEGER, p1=1)
+        with pytest.raises(AttributeError):
+            instr.p1 = 2
 
 
 class TestCursor:
@@ -90,6 +101,21 @@ class TestCursor:
         cursor.next()
         assert not cursor.is_valid()
     
+    def test_cursor_streams_rows(self, temp_db, monkeypatch):
+        btree = BTree(temp_db)
+        for key in range(1, 4):
+            btree.insert(key, Record([key]))
+        monkeypatch.setattr(btree, 'scan', lambda: pytest.fail("table materialized"))
+        
+        cursor = Cursor(btree)
+        cursor.rewind()
+        keys = [cursor.get_key()]
+        while cursor.next():
+            keys.append(cursor.get_key())
+        
+        assert keys == [1, 2, 3]
+        assert cursor.get_data() is None
+    
     def test_cursor_seek(self, temp_db):
         btree = BTree(temp_db)
         btree.insert(1, Record([100]))
@@ -103,6 +129,25 @@ class TestCursor:
         
         assert not cursor.seek(99)
         assert not cursor.is_valid()
+    
+    def test_cursor_seek_after_rewind(self, temp_db):
+        btree = BTree(temp_db)
+        for key in range(0, 200, 2):
+            btree.insert(key, Record([key * 10]))
+        
+        cursor = Cursor(btree)
+        assert cursor.seek(0)
+        assert cursor.seek(198)
+        assert cursor.get_data().get_values() == [1980]
+        assert not cursor.seek(99)
+        assert not cursor.seek(-1)
+        
+        btree.insert(99, Record([990]))
+        cursor.rewind()
+        assert cursor.seek(99)
+        assert cursor.get_key() == 99
+        assert cursor.next()
+        assert cursor.get_key() == 100
 
 
 class TestDatabaseMachine:
@@ -124,6 +169,22 @@ class TestDatabaseMachine:
         assert results == []
         assert dbm.halted
     
+    def test_instruction_not_formatted_without_trace(self, temp_db, monkeypatch):
+        dbm = DatabaseMachine(temp_db)
+        monkeypatch.setattr(Instruction, '__repr__', lambda self: pytest.fail("formatted"))
+        
+        assert dbm.execute([Instruction(Opcode.INTEGER, p1=1), Instruction(Opcode.HALT)]) == []
+    
+    def test_every_opcode_has_a_handler(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        assert set(dbm._dispatch) == set(Opcode)
+    
+    def test_unknown_opcode(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        
+        with pytest.raises(ValueError, match="Unknown opcode"):
+            dbm._execute_instruction(Instruction(99))
+    
     def test_integer_instruction(self, temp_db):
         dbm = DatabaseMachine(temp_db)
         program = [
@@ -135,6 +196,30 @@ class TestDatabaseMachine:
         assert len(dbm.stack) == 1
         assert dbm.stack[0] == 42
     
+    def test_result_row_takes_top_values_in_order(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        program = [
+            Instruction(Opcode.INTEGER, p1=1),
+            Instruction(Opcode.INTEGER, p1=2),
+            Instruction(Opcode.STRING, p4="three"),
+            Instruction(Opcode.RESULT_ROW, p1=2),
+            Instruction(Opcode.RESULT_ROW, p1=0),
+            Instruction(Opcode.HALT)
+        ]
+        
+        assert dbm.execute(program) == [[2, "three"], []]
+        assert dbm.stack == [1]
+    
+    def test_result_row_stack_underflow(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        program = [
+            Instruction(Opcode.INTEGER, p1=1),
+            Instruction(Opcode.RESULT_ROW, p1=2),
+        ]
+        
+        with pytest.raises(RuntimeError, match="RESULT_ROW requires 2"):
+            dbm.execute(program)
+    
     def test_string_instruction(self, temp_db):
         dbm = DatabaseMachine(temp_db)
         program = [
@@ -172,6 +257,17 @@ class TestDatabaseMachine:
         assert isinstance(record, Record)
         assert record.get_value(0) == 42
         assert record.get_value(1) == "test"
+    
+    def test_variable_instruction(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        program = [
+            Instruction(Opcode.VARIABLE, p1=1),
+            Instruction(Opcode.VARIABLE, p1=0),
+            Instruction(Opcode.HALT)
+        ]
+        
+        dbm.execute(program, params=[7, "bound"])
+        assert dbm.stack == ["bound", 7]
 
 
 class TestDatabaseMachineTableOperations:
@@ -298,6 +394,27 @@ class TestDatabaseMachineComparisons:
         
         dbm.execute(program)
         assert dbm.stack[0] is False
+    
+    @pytest.mark.parametrize("opcode, expected", [
+        (Opcode.NE, True), (Opcode.LE, True), (Opcode.GE, False),
+    ])
+    def test_remaining_comparisons(self, temp_db, opcode, expected):
+        dbm = DatabaseMachine(temp_db)
+        program = [
+            Instruction(Opcode.INTEGER, p1=3),
+            Instruction(Opcode.INTEGER, p1=7),
+            Instruction(opcode),
+            Instruction(Opcode.HALT)
+        ]
+        
+        dbm.execute(program)
+        assert dbm.stack == [expected]
+    
+    def test_comparison_stack_underflow(self, temp_db):
+        dbm = DatabaseMachine(temp_db)
+        
+        with pytest.raises(RuntimeError, match="Comparison requires 2"):
+            dbm.execute([Instruction(Opcode.INTEGER, p1=1), Instruction(Opcode.LT)])
 
 
 class TestDatabaseMachineJumps:
@@ -37,6 +37,15 @@ class TestDatabaseLogger:
         logger.info("info")
         logger.debug("debug")
         logger.trace("trace")
+    
+    def test_lazy_formatting_args(self, caplog):
+        logger = DatabaseLogger("test_lazy", LogLevel.INFO)
+        
+        with caplog.at_level(LogLevel.INFO, logger="test_lazy"):
+            logger.info("Updated %d rows in '%s'", 3, "users")
+            logger.debug("dropped %s", "debug")
+        
+        assert [r.getMessage() for r in caplog.records] == ["Updated 3 rows in 'users'"]
 
 
 class TestGlobalLoggers:
@@ -57,6 +66,15 @@ class TestGlobalLoggers:
         assert logger1 is not logger2
         assert logger1.logger.name != logger2.logger.name
     
+    def test_is_trace_enabled(self):
+        logger = get_logger("trace_check")
+        
+        logger.set_level(LogLevel.DEBUG)
+        assert not logger.is_trace_enabled()
+        
+        logger.set_level(LogLevel.TRACE)
+        assert logger.is_trace_enabled()
+    
     def test_set_global_level(self):
         logger1 = get_logger("comp1")
         logger2 = get_logger("comp2")
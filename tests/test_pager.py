@@ -171,6 +171,64 @@ class TestPageReadWrite:
         assert page1 is page2
         
         pager.close()
+    
+    def test_prefetch_loads_pages_into_cache(self, temp_db_file):
+        with Pager(temp_db_file) as pager:
+            for i in range(5):
+                page_id = pager.allocate_page()
+                pager.write_page(page_id, bytes([i + 1]) * pager.page_size)
+        
+        with Pager(temp_db_file) as pager:
+            pager.prefetch([1, 2, 4, 5, 99])
+            
+            assert sorted(pager.page_cache) == [1, 2, 4, 5]
+            assert pager.read_page(4) == bytes([4]) * pager.page_size
+    
+    def test_flush_writes_dirty_runs(self, temp_db_file):
+        with Pager(temp_db_file) as pager:
+            for i in range(6):
+                page_id = pager.allocate_page()
+                pager.write_page(page_id, bytes([i + 1]) * pager.page_size)
+            pager.flush()
+            
+            for page_id in (5, 2, 3, 6):
+                pager.write_page(page_id, bytes([page_id * 10]) * pager.page_size)
+            pager.flush()
+            
+            assert not pager.dirty_pages
+        
+        with Pager(temp_db_file) as pager:
+            for page_id in range(1, 7):
+                expected = page_id * 10 if page_id in (2, 3, 5, 6) else page_id
+                assert pager.read_page(page_id) == bytes([expected]) * pager.page_size
+    
+    def test_write_page_reuses_cached_buffer(self, temp_db_file):
+        with Pager(temp_db_file) as pager:
+            page_id = pager.allocate_page()
+            pager.flush()
+            
+            buffer = pager.read_page(page_id)
+            buffer[0:4] = b'abcd'
+            pager.write_page(page_id, buffer)
+            
+            assert pager.read_page(page_id) is buffer
+            assert page_id in pager.dirty_pages
+            
+            data = bytearray(b'\x01' * pager.page_size)
+            pager.write_page(page_id, data)
+            data[0] = 2
+            
+            assert pager.read_page(page_id)[0] == 1
+    
+    def test_prefetch_keeps_cached_pages(self, temp_db_file):
+        with Pager(temp_db_file) as pager:
+            page_id = pager.allocate_page()
+            pager.flush()
+            
+            pager.write_page(page_id, b'\x07' * pager.page_size)
+            pager.prefetch([page_id])
+            
+            assert pager.read_page(page_id) == b'\x07' * pager.page_size
 
 
 class TestPageAllocation:
@@ -210,6 +268,18 @@ class TestPageAllocation:
         assert all(b == 0 for b in page)
         
         pager.close()
+    
+    def test_allocate_page_with_initial_data(self, temp_db_file):
+        pager = Pager(temp_db_file)
+        
+        page_id = pager.allocate_page(b'\x02\x00\x00')
+        page = pager.read_page(page_id)
+        
+        assert page[:3] == b'\x02\x00\x00'
+        assert all(b == 0 for b in page[3:])
+        assert page_id in pager.dirty_pages
+        
+        pager.close()
 
 
 class TestPagerFlush:
@@ -35,6 +35,22 @@ class TestRecordBasics:
         with pytest.raises(IndexError):
             record.get_value(-1)
     
+    def test_set_value(self):
+        record = Record([1, 2, 3])
+        record.set_value(1, "two")
+        
+        assert record.get_values() == [1, "two", 3]
+        
+        with pytest.raises(IndexError):
+            record.set_value(3, 4)
+    
+    def test_record_has_no_instance_dict(self):
+        record = Record([1, 2, 3])
+        
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.extra = 1
+    
     def test_record_equality(self):
         record1 = Record([1, 2, 3])
         record2 = Record([1, 2, 3])
@@ -170,6 +186,23 @@ class TestRecordDecoding:
         assert decoded == original
         assert decoded.get_value(0) == b'\x00\x01\x02\xff'
     
+    def test_decode_at_offset(self):
+        original = Record([300, "text", b'blob'])
+        buffer = bytearray(b'\xff' * 5) + original.encode()
+        
+        decoded = Record.decode(buffer, 5)
+        
+        assert decoded == original
+        assert isinstance(decoded.get_value(2), bytes)
+    
+    def test_decode_bounded_negative_integer(self):
+        original = Record([7, -1])
+        encoded = original.encode()
+        # Bytes after the record must not be read as part of its last value
+        buffer = bytearray(encoded) + b'\x05\x00'
+        
+        assert Record.decode(buffer, 0, len(encoded)) == original
+    
     def test_decode_boolean(self):
         original = Record([True, False])
         encoded = original.encode()
@@ -1,5 +1,7 @@
 """Tests for server/main.py — FastAPI routes and log capture."""
 
+import gzip
+import json
 import os
 import pytest
 from fastapi.testclient import TestClient
@@ -346,6 +348,24 @@ class TestPushSchema:
         assert data["executed"] == 2
         assert len(data["logs"]) > 0
 
+    def test_push_gzip_body(self, client, auth_headers, test_db):
+        body = json.dumps({"statements": ["CREATE TABLE users (id INTEGER, name TEXT)"]}).encode()
+        resp = client.post(
+            f"/api/v1/databases/{test_db}/push",
+            content=gzip.compress(body),
+            headers={**auth_headers, "Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["executed"] == 1
+
+    def test_push_invalid_gzip_body(self, client, auth_headers, test_db):
+        resp = client.post(
+            f"/api/v1/databases/{test_db}/push",
+            content=b"not gzip",
+            headers={**auth_headers, "Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        assert resp.status_code == 400
+
     def test_push_with_error(self, client, auth_headers, test_db):
         """If one statement fails, it should be logged but others still run."""
         resp = client.post(
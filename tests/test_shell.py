@@ -8,7 +8,8 @@ import os
 from io import StringIO
 from unittest.mock import patch, MagicMock
 from chidb.api import YesDB
-from chidb.cli.shell import Shell, main
+from chidb.record import Record
+from chidb.cli.shell import Shell, main, _complete_sql
 
 
 @pytest.fixture
@@ -77,6 +78,18 @@ class TestSQLExecution:
         
         test_db.close()
     
+    def test_execute_select_order_by_projection(self, test_db):
+        shell = Shell(test_db)
+        
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.execute_sql('SELECT name FROM users ORDER BY id DESC')
+            output = fake_out.getvalue()
+        
+        assert '| Bob   |' in output
+        assert output.index('Bob') < output.index('Alice')
+        
+        test_db.close()
+    
     def test_execute_insert(self, test_db):
         shell = Shell(test_db)
         
@@ -87,6 +100,29 @@ class TestSQLExecution:
         
         test_db.close()
     
+    def test_execute_non_select_skips_shell_parse(self, test_db):
+        shell = Shell(test_db)
+        
+        with patch('chidb.cli.shell.Parser') as parser, \
+             patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.execute_sql("INSERT INTO users VALUES (3, 'Carol')")
+            assert 'Query executed' in fake_out.getvalue()
+        
+        parser.assert_not_called()
+        test_db.close()
+    
+    def test_execute_select_without_metadata_skips_shell_parse(self):
+        db = MagicMock(spec=['execute'])
+        db.execute.return_value = [[1, 'Alice']]
+        shell = Shell(db)
+        
+        with patch('chidb.cli.shell.Parser') as parser, \
+             patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.execute_sql("SELECT * FROM users")
+            assert 'Alice' in fake_out.getvalue()
+        
+        parser.assert_not_called()
+    
     def test_execute_invalid_sql(self, test_db):
         shell = Shell(test_db)
         
@@ -199,6 +235,62 @@ class TestResultPrinting:
         
         test_db.close()
     
+    def test_print_aligns_columns(self, test_db):
+        shell = Shell(test_db)
+        results = [[1, 'Alice'], [22, 'Bo']]
+        
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.print_results(results)
+            lines = fake_out.getvalue().splitlines()
+        
+        assert lines[:4] == [
+            '+----+-------+',
+            '| 1  | Alice |',
+            '| 22 | Bo    |',
+            '+----+-------+',
+        ]
+        
+        test_db.close()
+    
+    def test_print_record_projection(self, test_db):
+        shell = Shell(test_db)
+        results = [[Record([1, 'Alice'])], [Record([2, 'Bob'])]]
+        
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.print_results(results, ['name', 'missing', 'id'], 'users')
+            lines = fake_out.getvalue().splitlines()
+        
+        assert lines[1] == '| Alice | 1 |'
+        assert lines[2] == '| Bob   | 2 |'
+        
+        test_db.close()
+    
+    def test_print_rows_of_different_lengths(self, test_db):
+        shell = Shell(test_db)
+        results = [[Record([5, 'q'])], [Record([7, 's', 1])]]
+        
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.print_results(results)
+            lines = fake_out.getvalue().splitlines()
+        
+        assert lines[0] == '+---+---+---+'
+        assert lines[1] == '| 5 | q |   |'
+        assert lines[2] == '| 7 | s | 1 |'
+        
+        test_db.close()
+    
+    def test_print_mixed_record_row(self, test_db):
+        shell = Shell(test_db)
+        results = [[Record([1, 'Alice']), None]]
+        
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.print_results(results)
+            lines = fake_out.getvalue().splitlines()
+        
+        assert lines[1] == '| 1 | Alice | NULL |'
+        
+        test_db.close()
+    
     def test_print_null_values(self, test_db):
         shell = Shell(test_db)
         results = [[1, None]]
@@ -241,8 +333,8 @@ class TestShellInteraction:
     def test_shell_run_with_exit(self, test_db):
         shell = Shell(test_db)
         
-        # Mock input to return .exit
-        with patch('builtins.input', side_effect=['.exit']):
+        # Pipe in .exit
+        with patch('sys.stdin', new=StringIO('.exit\n')):
             with patch('sys.stdout', new=StringIO()):
                 shell.run()
         
@@ -252,8 +344,8 @@ class TestShellInteraction:
     def test_shell_handles_empty_input(self, test_db):
         shell = Shell(test_db)
         
-        # Mock input: empty line then exit
-        with patch('builtins.input', side_effect=['', '.exit']):
+        # Pipe in an empty line then exit
+        with patch('sys.stdin', new=StringIO('\n.exit\n')):
             with patch('sys.stdout', new=StringIO()):
                 shell.run()
         
@@ -263,11 +355,40 @@ class TestShellInteraction:
         shell = Shell(test_db)
         
         # Simulate Ctrl+C then exit
-        with patch('builtins.input', side_effect=[KeyboardInterrupt(), '.exit']):
+        stdin = MagicMock()
+        stdin.isatty.return_value = False
+        stdin.readline.side_effect = [KeyboardInterrupt(), '.exit\n']
+        with patch('sys.stdin', new=stdin):
             with patch('sys.stdout', new=StringIO()):
                 shell.run()
         
         test_db.close()
+    
+    def test_shell_runs_piped_sql_until_eof(self, test_db):
+        shell = Shell(test_db)
+        
+        with patch('sys.stdin', new=StringIO("SELECT * FROM users\n")), \
+             patch('sys.stdout', new=StringIO()) as fake_out:
+            shell.run()
+            output = fake_out.getvalue()
+        
+        assert 'yes_db> ' not in output
+        assert 'Alice' in output
+        assert output.endswith('Goodbye!\n')
+        test_db.close()
+    
+    def test_shell_prompts_on_terminal(self, test_db):
+        shell = Shell(test_db)
+        stdin = MagicMock()
+        stdin.isatty.return_value = True
+        
+        with patch('sys.stdin', new=stdin), \
+             patch('builtins.input', side_effect=['.exit']) as fake_input, \
+             patch('sys.stdout', new=StringIO()):
+            shell.run()
+        
+        fake_input.assert_called_once_with('yes_db> ')
+        test_db.close()
 
 
 class TestCommandLineArguments:
@@ -314,4 +435,13 @@ class TestEdgeCases:
             output = fake_out.getvalue()
             assert 'no tables' in output
         
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+class TestReadline:
+    """Test interactive line editing support."""
+    
+    def test_complete_sql_keywords(self):
+        assert _complete_sql('sel', 0) == 'SELECT '
+        assert _complete_sql('sel', 1) is None
+        assert _complete_sql('zzz', 0) is None
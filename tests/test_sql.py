@@ -47,6 +47,15 @@ class TestLexerBasics:
         assert token.value == 'SELECT'
 
 
+    def test_lexer_reuse(self):
+        lexer = Lexer()
+        lexer.tokenize('SELECT * FROM users')
+        tokens = lexer.tokenize('DELETE FROM posts')
+        assert tokens[0].type == TokenType.DELETE
+        assert tokens[0].column == 1
+        assert tokens[-1].type == TokenType.EOF
+
+
 class TestKeywords:
     """Test keyword recognition."""
     
@@ -309,6 +318,13 @@ class TestParserBasics:
         assert ast.table == 'users'
         assert ast.where is None
     
+    def test_parser_reuse(self):
+        parser = Parser()
+        parser.parse(tokenize('SELECT * FROM users'))
+        ast = parser.parse(tokenize("INSERT INTO users VALUES (1, 'a')"))
+        assert isinstance(ast, InsertStatement)
+        assert ast.values == [1, 'a']
+    
     def test_parse_select_specific_columns(self):
         ast = parse('SELECT name, age FROM users')
         assert isinstance(ast, SelectStatement)